@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ApiConfig(AppConfig):
+    name = 'api'
+
+    def ready(self):
+        from api_yamdb import connections  # noqa: F401
+
+        from . import signals  # noqa: F401
@@ -0,0 +1,195 @@
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from reviews import bulk
+from reviews.models import Category, Genre, Review, Title
+
+from .cache import invalidate_catalog_on_commit
+from .serializers import (CategoryBulkSerializer, GenreBulkSerializer,
+                          ReviewBulkSerializer, TitleBulkSerializer)
+
+
+def get_items(request):
+    items = request.data
+    if not isinstance(items, list):
+        raise ValidationError(
+            {'non_field_errors': ['Ожидается список объектов.']})
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise ValidationError({'non_field_errors': [
+            f'Можно передать не больше {settings.BULK_MAX_ITEMS} объектов.'
+        ]})
+    return items
+
+
+def validate_items(items, serializer_class, **kwargs):
+    '''Validate every item on its own, returns validated data and errors
+    by item index.'''
+    valid, errors = {}, {}
+    for index, item in enumerate(items):
+        serializer = serializer_class(data=item, **kwargs)
+        if serializer.is_valid():
+            valid[index] = serializer.validated_data
+        else:
+            errors[index] = serializer.errors
+    return valid, errors
+
+
+def bulk_response(size, saved, errors, success=status.HTTP_201_CREATED):
+    '''Results follow the order of items, failed ones hold their
+    errors.'''
+    results = [saved[index] if index in saved else {'errors': errors[index]}
+               for index in range(size)]
+    if not errors:
+        return Response(results, status=success)
+    if not saved:
+        return Response(results, status=status.HTTP_400_BAD_REQUEST)
+    return Response(results, status=status.HTTP_207_MULTI_STATUS)
+
+
+def slug_map(model, slugs):
+    return dict(model.objects.filter(slug__in=set(slugs)).values_list(
+        'slug', 'pk'))
+
+
+def resolve_slugs(valid, errors):
+    '''Replace genre and category slugs with ids using one query per
+    model.'''
+    categories = slug_map(
+        Category, [data['category'] for data in valid.values()
+                   if 'category' in data])
+    genres = slug_map(
+        Genre, [slug for data in valid.values()
+                for slug in data.get('genre', ())])
+    for index, data in list(valid.items()):
+        item_errors = {}
+        if 'category' in data and data['category'] not in categories:
+            item_errors['category'] = [
+                f'Объект с slug={data["category"]} не существует.']
+        missing = [slug for slug in data.get('genre', ())
+                   if slug not in genres]
+        if missing:
+            item_errors['genre'] = [
+                f'Объект с slug={slug} не существует.' for slug in missing]
+        if item_errors:
+            errors[index] = item_errors
+            del valid[index]
+            continue
+        if 'category' in data:
+            data['category'] = categories[data['category']]
+        if 'genre' in data:
+            data['genre'] = [genres[slug] for slug in data['genre']]
+
+
+def create_titles(items):
+    valid, errors = validate_items(items, TitleBulkSerializer)
+    resolve_slugs(valid, errors)
+    genre_ids = [data.pop('genre') for data in valid.values()]
+    titles = [Title(category_id=data.pop('category'), **data)
+              for data in valid.values()]
+    if titles:
+        bulk.create_titles(titles, genre_ids)
+        invalidate_catalog_on_commit()
+    return dict(zip(valid, titles)), errors
+
+
+def is_id(pk):
+    '''JSON true and false load as bool, a subclass of int.'''
+    return isinstance(pk, int) and not isinstance(pk, bool)
+
+
+def load_titles(items, valid, errors):
+    '''Titles to update by item index, loaded with one query.'''
+    ids = {index: items[index].get('id') for index in valid}
+    titles = Title.objects.in_bulk(
+        [pk for pk in ids.values() if is_id(pk)])
+    found, seen = {}, set()
+    for index, pk in ids.items():
+        if not is_id(pk):
+            errors[index] = {'id': ['Обязательное поле.']}
+        elif pk not in titles:
+            errors[index] = {'id': ['Произведение не найдено.']}
+        elif pk in seen:
+            errors[index] = {'id': ['Произведение уже есть в запросе.']}
+        else:
+            found[index] = titles[pk]
+            seen.add(pk)
+            continue
+        del valid[index]
+    return found
+
+
+def update_titles(items):
+    valid, errors = validate_items(items, TitleBulkSerializer, partial=True)
+    titles = load_titles(items, valid, errors)
+    resolve_slugs(valid, errors)
+    fields, genre_ids, saved = set(), {}, {}
+    for index, data in valid.items():
+        title = saved[index] = titles[index]
+        if 'genre' in data:
+            genre_ids[title.pk] = data.pop('genre')
+        if 'category' in data:
+            title.category_id = data.pop('category')
+            fields.add('category')
+        for name, value in data.items():
+            setattr(title, name, value)
+        fields.update(data)
+    if saved:
+        bulk.update_titles(list(saved.values()), fields, genre_ids)
+        invalidate_catalog_on_commit()
+    return saved, errors
+
+
+def create_slugged(items, serializer_class):
+    '''Create genres or categories, slugs must be new.'''
+    model = serializer_class.Meta.model
+    valid, errors = validate_items(items, serializer_class)
+    existing = set(slug_map(
+        model, [data['slug'] for data in valid.values()]))
+    for index, data in list(valid.items()):
+        if data['slug'] in existing:
+            errors[index] = {'slug': [
+                f'{model._meta.verbose_name} с таким slug уже существует.']}
+            del valid[index]
+        existing.add(data['slug'])
+    objs = [model(**data) for data in valid.values()]
+    if objs:
+        model.objects.bulk_create(objs)
+        invalidate_catalog_on_commit()
+    return dict(zip(valid, objs)), errors
+
+
+def create_genres(items):
+    return create_slugged(items, GenreBulkSerializer)
+
+
+def create_categories(items):
+    return create_slugged(items, CategoryBulkSerializer)
+
+
+def create_reviews(items, request):
+    '''Create reviews of the current user for several titles.'''
+    valid, errors = validate_items(
+        items, ReviewBulkSerializer, context={'request': request})
+    title_ids = {data['title_id'] for data in valid.values()}
+    known = set(Title.objects.filter(pk__in=title_ids).values_list(
+        'pk', flat=True))
+    reviewed = set(Review.objects.filter(
+        author=request.user, title_id__in=title_ids
+    ).values_list('title_id', flat=True))
+    for index, data in list(valid.items()):
+        if data['title_id'] not in known:
+            errors[index] = {'title': ['Произведение не найдено.']}
+        elif data['title_id'] in reviewed:
+            errors[index] = {'non_field_errors': [
+                'Можно оставить только один отзыв на произведение.']}
+        else:
+            reviewed.add(data['title_id'])
+            continue
+        del valid[index]
+    reviews = [Review(author=request.user, **data)
+               for data in valid.values()]
+    if reviews:
+        bulk.create_reviews(reviews)
+        invalidate_catalog_on_commit()
+    return dict(zip(valid, reviews)), errors
@@ -0,0 +1,77 @@
+from hashlib import md5
+
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from api_yamdb.routers import reading_from_replica
+
+CACHE_ALIAS = 'api'
+GENERATION_KEY = 'catalog:generation'
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def catalog_generation():
+    return get_cache().get(GENERATION_KEY, 0)
+
+
+def invalidate_catalog():
+    '''Make every cached catalog response stale at once.'''
+    cache = get_cache()
+    cache.add(GENERATION_KEY, 0, timeout=None)
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, timeout=None)
+
+
+def invalidate_catalog_on_commit():
+    '''Invalidate once the current transaction commits, earlier a
+    request could still read the old rows and cache them under the new
+    generation.'''
+    transaction.on_commit(invalidate_catalog)
+
+
+def response_cache_key(request):
+    '''Responses read from replicas are kept apart, a replica that lags
+    behind must not serve users pinned to the primary database.'''
+    query = sorted(request.query_params.lists())
+    url = '{}?{}'.format(
+        request.build_absolute_uri(request.path),
+        '&'.join(f'{key}={value}' for key, values in query
+                 for value in values),
+    )
+    return 'catalog:{}:{}:{}'.format(
+        catalog_generation(),
+        'replica' if reading_from_replica() else 'primary',
+        md5(url.encode()).hexdigest(),
+    )
+
+
+def cached_response(handler, request, *args, **kwargs):
+    cache = get_cache()
+    key = response_cache_key(request)
+    data = cache.get(key)
+    if data is not None:
+        return Response(data)
+    response = handler(request, *args, **kwargs)
+    if response.status_code == 200:
+        cache.set(key, response.data)
+    return response
+
+
+class CachedListMixin:
+    '''Serve list responses from the api cache.'''
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(super().list, request, *args, **kwargs)
+
+
+class CachedRetrieveMixin:
+    '''Serve detail responses from the api cache.'''
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,81 @@
+from calendar import timegm
+from hashlib import md5
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def version_stamp(queryset):
+    '''Count and last modification time of the rows of a queryset.
+
+    modified is never null, counting it lets the (parent, modified)
+    indexes answer without reading the rows.
+    '''
+    stamp = queryset.order_by().aggregate(
+        count=Count('modified'), modified=Max('modified'))
+    return stamp['count'], stamp['modified']
+
+
+class ConditionalGetMixin:
+    '''Answer GET with 304 Not Modified before serializing anything.
+
+    Lists get an ETag from list_version. Single objects also get
+    Last-Modified, which is not safe for lists because deleting a row
+    does not move it.
+    '''
+
+    def list_version(self, queryset):
+        '''Version of the rows of a list, by default their number and
+        latest modification time. None skips conditional handling.
+
+        Cursor pages are meant to avoid queries over the whole list, so
+        they go without an ETag.
+        '''
+        if (self.paginator is not None
+                and self.paginator.is_cursor_request(self.request)):
+            return None
+        count, modified = version_stamp(queryset)
+        return '{}:{}'.format(count, modified.isoformat() if modified else '')
+
+    def list(self, request, *args, **kwargs):
+        version = self.list_version(
+            self.filter_queryset(self.get_queryset()))
+        if version is None:
+            return super().list(request, *args, **kwargs)
+        return self.conditional_response(
+            super().list, version, None, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: kwargs[lookup_url_kwarg]})
+        except (TypeError, ValueError, ValidationError):
+            # Same as get_object() for a lookup value of the wrong type.
+            raise Http404
+        count, modified = version_stamp(queryset)
+        if not count:
+            return super().retrieve(request, *args, **kwargs)
+        return self.conditional_response(
+            super().retrieve, '{}:{}'.format(count, modified.isoformat()),
+            timegm(modified.utctimetuple()), request, *args, **kwargs)
+
+    def conditional_response(self, handler, version, last_modified,
+                             request, *args, **kwargs):
+        version = '{}:{}:{}'.format(
+            request.accepted_renderer.format, request.get_full_path(),
+            version,
+        )
+        etag = quote_etag(md5(version.encode()).hexdigest())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
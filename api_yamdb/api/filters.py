@@ -1,15 +1,29 @@
 from django_filters import rest_framework as filters
 from reviews.models import Title
 
+from .search import search_titles
+
+
+class NumberInFilter(filters.BaseInFilter, filters.NumberFilter):
+    pass
+
 
 class TitleFilter(filters.FilterSet):
     name = filters.CharFilter(lookup_expr='icontains')
-    year = filters.NumberFilter(lookup_expr='icontains')
+    year = filters.NumberFilter()
+    year_min = filters.NumberFilter(field_name='year', lookup_expr='gte')
+    year_max = filters.NumberFilter(field_name='year', lookup_expr='lte')
+    year_in = NumberInFilter(field_name='year')
     genre = filters.CharFilter(field_name='genre__slug',
                                lookup_expr='icontains')
     category = filters.CharFilter(field_name='category__slug',
                                   lookup_expr='icontains')
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ['name', 'year', 'genre', 'category']
+        fields = ['name', 'year', 'year_min', 'year_max', 'year_in',
+                  'genre', 'category', 'search']
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
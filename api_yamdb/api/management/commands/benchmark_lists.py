@@ -0,0 +1,90 @@
+import time
+
+from api.renderers import FastJSONRenderer
+from api.serializers import ReviewSerializer, TitleSerializerGet
+from api.values import ReviewValues, TitleValues
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from reviews.bulk import bulk_insert
+from reviews.models import Category, Genre, Review, Title
+from users.models import User
+
+
+class Command(BaseCommand):
+    '''Compare list serialization through serializers and through
+    .values() rows.
+
+    Data is created inside a transaction that is rolled back.
+    '''
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=1000)
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def seed(self, count):
+        category = Category.objects.create(name='Бенчмарк', slug='bench')
+        genres = bulk_insert(Genre, [
+            Genre(name=f'Жанр {number}', slug=f'bench-{number}')
+            for number in range(3)])
+        titles = bulk_insert(Title, [
+            Title(name=f'Произведение {number}', year=2000,
+                  description='Описание произведения. ' * 20,
+                  category=category)
+            for number in range(count)])
+        Title.genre.through.objects.bulk_create(
+            Title.genre.through(title_id=title.pk, genre_id=genre.pk)
+            for title in titles for genre in genres)
+        authors = bulk_insert(User, [
+            User(username=f'bench{number}', email=f'bench{number}@yamdb.fake')
+            for number in range(count)])
+        Review.objects.bulk_create(
+            Review(text='Отзыв. ' * 20, score=5, title=titles[0],
+                   author=author)
+            for author in authors)
+        return titles[0]
+
+    def measure(self, name, render, page_size, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            render()
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        median = timings[len(timings) // 2]
+        self.stdout.write(
+            f'{name:32} {median * 1000:9.2f} ms '
+            f'{page_size / median:12.0f} items/s')
+
+    def handle(self, *args, **options):
+        page_size = options['page_size']
+        with transaction.atomic():
+            title = self.seed(options['titles'])
+            titles = Title.objects.filter(category__slug='bench').order_by(
+                'id')
+            reviews = title.reviews.order_by('pub_date', 'id')
+            title_names = list(TitleSerializerGet().fields)
+            review_names = [name for name, field
+                            in ReviewSerializer().fields.items()
+                            if not field.write_only]
+            cases = {
+                'titles, serializer': lambda: JSONRenderer().render(
+                    TitleSerializerGet(
+                        titles.select_related('category').prefetch_related(
+                            'genre')[:page_size], many=True).data),
+                'titles, values': lambda: FastJSONRenderer().render(
+                    TitleValues(title_names).represent(titles.values(
+                        *TitleValues(title_names).values(('id',)))[
+                        :page_size])),
+                'reviews, serializer': lambda: JSONRenderer().render(
+                    ReviewSerializer(reviews.select_related('author')[
+                        :page_size], many=True).data),
+                'reviews, values': lambda: FastJSONRenderer().render(
+                    ReviewValues(review_names).represent(reviews.values(
+                        *ReviewValues(review_names).values())[
+                        :page_size])),
+            }
+            for name, render in cases.items():
+                self.measure(name, render, page_size, options['repeat'])
+            transaction.set_rollback(True)
@@ -0,0 +1,70 @@
+import time
+
+from api.throttling import TokenBuckets, TokenBucketThrottle
+from django.core.management.base import BaseCommand
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import AnonRateThrottle
+
+
+class OpenThrottle(TokenBucketThrottle):
+    rate = '1000000000/s'
+    buckets = TokenBuckets(100000)
+
+
+class ClosedThrottle(TokenBucketThrottle):
+    rate = '1/d'
+    buckets = TokenBuckets(100000)
+
+
+class CacheThrottle(AnonRateThrottle):
+    # A short history, DRF keeps the time of every allowed request.
+    rate = '10/s'
+
+
+class Command(BaseCommand):
+    '''Time one throttle check, creating the throttle as views do.'''
+
+    def add_arguments(self, parser):
+        parser.add_argument('--checks', type=int, default=100000)
+        parser.add_argument('--clients', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def requests(self, clients):
+        factory = APIRequestFactory()
+        return [
+            Request(factory.post(
+                '/api/v1/auth/signup/',
+                REMOTE_ADDR=f'10.{number >> 16 & 255}.{number >> 8 & 255}.'
+                            f'{number & 255}'),
+                    authenticators=())
+            for number in range(clients)
+        ]
+
+    def measure(self, name, throttle_class, requests, checks, repeat):
+        size = len(requests)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for number in range(checks):
+                throttle_class().allow_request(requests[number % size], None)
+            timings.append((time.perf_counter() - started) / checks)
+        timings.sort()
+        self.stdout.write(
+            f'{name:40} {timings[len(timings) // 2] * 1e6:8.2f} us/check')
+
+    def handle(self, *args, **options):
+        checks, repeat = options['checks'], options['repeat']
+        one = self.requests(1)
+        many = self.requests(options['clients'])
+        for request in one + many:
+            # Authenticate once, as views do before throttling.
+            request.user
+        cases = {
+            'token bucket, one client': (OpenThrottle, one),
+            'token bucket, many clients': (OpenThrottle, many),
+            'token bucket, throttled': (ClosedThrottle, one),
+            'DRF cache throttle, one client, 10/s': (CacheThrottle, one),
+        }
+        for name, (throttle_class, requests) in cases.items():
+            self.measure(name, throttle_class, requests, checks, repeat)
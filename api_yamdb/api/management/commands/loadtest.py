@@ -0,0 +1,56 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+from threading import local
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    '''Send GET requests to a running server from many threads and
+    report throughput and latency.'''
+
+    def add_arguments(self, parser):
+        parser.add_argument('url')
+        parser.add_argument('--concurrency', type=int, default=64)
+        parser.add_argument('--requests', type=int, default=5000)
+        parser.add_argument('--host', default=None,
+                            help='Host header, host of the url by default.')
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        path = url.path + (f'?{url.query}' if url.query else '')
+        headers = {'Host': options['host'] or url.netloc}
+        connections = local()
+
+        def request(_):
+            # Every thread keeps its own connection alive.
+            if not hasattr(connections, 'connection'):
+                connections.connection = HTTPConnection(
+                    url.hostname, url.port or 80, timeout=60)
+            started = time.perf_counter()
+            try:
+                connections.connection.request('GET', path, headers=headers)
+                response = connections.connection.getresponse()
+                response.read()
+            except OSError:
+                del connections.connection
+                return None, time.perf_counter() - started
+            if response.will_close:
+                del connections.connection
+            return response.status, time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            results = list(pool.map(request, range(options['requests'])))
+        elapsed = time.perf_counter() - started
+        failed = sum(status != 200 for status, _ in results)
+        if failed == len(results):
+            raise CommandError('Every request failed.')
+        timings = sorted(timing for _, timing in results)
+        self.stdout.write(
+            f'{len(results)} requests, {failed} failed, '
+            f'{len(results) / elapsed:.0f} requests/s, latency '
+            f'p50 {timings[len(timings) // 2] * 1000:.0f} ms, '
+            f'p99 {timings[int(len(timings) * 0.99)] * 1000:.0f} ms')
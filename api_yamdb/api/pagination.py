@@ -0,0 +1,177 @@
+from base64 import b64decode, b64encode
+from urllib import parse
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (BasePagination, Cursor,
+                                       CursorPagination, PageNumberPagination,
+                                       _reverse_ordering)
+from rest_framework.utils.urls import replace_query_param
+
+CURSOR_MODE = 'cursor'
+
+
+class KeysetPagination(CursorPagination):
+    '''Cursor pagination keyed on every ordering field.
+
+    CursorPagination keeps only the first field in the cursor and steps
+    over ties with an offset capped at offset_cutoff. Here the cursor
+    holds the values of all fields, a page is the rows after them in
+    the ordering, so ties on pub_date cost nothing.
+    '''
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            tokens = parse.parse_qs(
+                b64decode(encoded.encode('ascii')).decode('ascii'),
+                keep_blank_values=True)
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        position = tokens.get('p')
+        if position is not None and len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        tokens = {}
+        if cursor.reverse:
+            tokens['r'] = '1'
+        if cursor.position is not None:
+            tokens['p'] = cursor.position
+        encoded = b64encode(parse.urlencode(tokens, doseq=True).encode(
+            'ascii')).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded)
+
+    def _get_position_from_instance(self, instance, ordering):
+        names = [field.lstrip('-') for field in ordering]
+        if isinstance(instance, dict):
+            return [str(instance[name]) for name in names]
+        return [str(getattr(instance, name)) for name in names]
+
+    def after(self, model, ordering, position):
+        '''Rows following position in ordering, as one Q.'''
+        condition, equal = Q(), {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            try:
+                value = model._meta.get_field(name).to_python(value)
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+            lookup = f'{name}__lt' if field.startswith('-') else f'{name}__gt'
+            condition |= Q(**equal, **{lookup: value})
+            equal[name] = value
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor and self.cursor.position
+        ordering = (_reverse_ordering(self.ordering) if reverse
+                    else self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(
+                self.after(queryset.model, ordering, position))
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        '''Rows after the last one of the page, or the first page when
+        a previous link ran out of rows.'''
+        if not self.has_next:
+            return None
+        position = None
+        if self.page:
+            position = self._get_position_from_instance(
+                self.page[-1], self.ordering)
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        '''Rows before the first one of the page, or the last page when
+        a next link ran out of rows.'''
+        if not self.has_previous:
+            return None
+        position = None
+        if self.page:
+            position = self._get_position_from_instance(
+                self.page[0], self.ordering)
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=True, position=position))
+
+
+class KeysetOrPageNumberPagination(BasePagination):
+    '''Page number pagination with keyset mode on ?pagination=cursor.'''
+    mode_query_param = 'pagination'
+    cursor_ordering = ('id',)
+
+    def is_cursor_request(self, request):
+        return (request.query_params.get(self.mode_query_param) == CURSOR_MODE
+                or KeysetPagination.cursor_query_param in request.query_params)
+
+    def get_paginator(self, request):
+        if self.is_cursor_request(request):
+            paginator = KeysetPagination()
+            paginator.ordering = self.cursor_ordering
+            return paginator
+        return PageNumberPagination()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.get_paginator(request)
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return PageNumberPagination().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return (
+            PageNumberPagination().get_schema_operation_parameters(view)
+            + KeysetPagination().get_schema_operation_parameters(view)
+        )
+
+    def get_results(self, data):
+        return data['results']
+
+    @property
+    def display_page_controls(self):
+        '''Page controls of the browsable API come from the paginator
+        used by the last paginate_queryset.'''
+        paginator = getattr(self, 'paginator', None)
+        return paginator is not None and paginator.display_page_controls
+
+    def get_html_context(self):
+        return self.paginator.get_html_context()
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+
+class TitlePagination(KeysetOrPageNumberPagination):
+    cursor_ordering = ('id',)
+
+
+class PubDatePagination(KeysetOrPageNumberPagination):
+    cursor_ordering = ('pub_date', 'id')
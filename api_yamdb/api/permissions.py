@@ -25,4 +25,4 @@ class IsAdminOrAuthorOrReadOnly(permissions.BasePermission):
                 or request.user.is_superuser
                 or request.user.is_admin
                 or request.user.is_moderator
-                or obj.author == request.user)
+                or obj.author_id == request.user.pk)
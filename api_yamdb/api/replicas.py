@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+from api_yamdb import routers
+
+PIN_KEY = 'replicas:pinned:{}'
+
+
+def pin_to_primary(user):
+    '''Read from the primary database for the user for a while, so the
+    user sees their own changes before replicas catch up.'''
+    if settings.DATABASE_REPLICAS and user.is_authenticated:
+        cache.set(PIN_KEY.format(user.pk), True,
+                  settings.DB_REPLICA_STICKY_SECONDS)
+
+
+def is_pinned(user):
+    return user.is_authenticated and cache.get(PIN_KEY.format(user.pk),
+                                               False)
+
+
+class ReplicaReadMixin:
+    '''Serve safe requests from a read replica.
+
+    Users who changed something stay on the primary database for
+    DB_REPLICA_STICKY_SECONDS.
+    '''
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (settings.DATABASE_REPLICAS and request.method in SAFE_METHODS
+                and not is_pinned(request.user)):
+            routers.use_replica()
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+        finally:
+            routers.use_primary()
+        if (self.request.method not in SAFE_METHODS
+                and response.status_code < 400):
+            pin_to_primary(self.request.user)
+        return response
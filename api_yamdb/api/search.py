@@ -0,0 +1,129 @@
+import math
+import re
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, When
+from reviews.models import Title
+
+from .conditional import version_stamp
+
+SEARCH_CONFIG = 'simple'
+NAME_WEIGHT = 3
+TAXONOMY_WEIGHT = 2
+DESCRIPTION_WEIGHT = 1
+
+WORD_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return WORD_RE.findall(text.lower())
+
+
+class InvertedIndex:
+    '''In-memory index of title words for databases without full text
+    search. A query word also matches longer words starting with it.'''
+
+    def __init__(self, documents):
+        self.postings = defaultdict(dict)
+        self.size = 0
+        for doc_id, fields in documents:
+            self.size += 1
+            for text, weight in fields:
+                for term in tokenize(text):
+                    postings = self.postings[term]
+                    postings[doc_id] = postings.get(doc_id, 0) + weight
+        self.terms = sorted(self.postings)
+
+    def matches(self, word):
+        '''Weights of documents with words starting with word.'''
+        found = {}
+        position = bisect_left(self.terms, word)
+        while (position < len(self.terms)
+               and self.terms[position].startswith(word)):
+            for doc_id, weight in self.postings[
+                    self.terms[position]].items():
+                found[doc_id] = max(found.get(doc_id, 0), weight)
+            position += 1
+        return found
+
+    def search(self, query):
+        '''Ids of documents containing every query word, best first.'''
+        scores = None
+        for word in set(tokenize(query)):
+            found = self.matches(word)
+            idf = math.log(1 + self.size / len(found)) if found else 0
+            word_scores = {doc_id: weight * idf
+                           for doc_id, weight in found.items()}
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {doc_id: score + word_scores[doc_id]
+                          for doc_id, score in scores.items()
+                          if doc_id in word_scores}
+        return sorted(scores or {}, key=lambda doc_id: (
+            -scores[doc_id], doc_id))
+
+
+def title_documents():
+    taxonomy = defaultdict(list)
+    for title_id, genre in Title.genre.through.objects.values_list(
+            'title_id', 'genre__name').iterator():
+        taxonomy[title_id].append(genre)
+    titles = Title.objects.values_list(
+        'id', 'name', 'description', 'category__name').order_by()
+    for title_id, name, description, category in titles.iterator():
+        yield title_id, (
+            (name, NAME_WEIGHT),
+            (' '.join(taxonomy[title_id] + [category or '']),
+             TAXONOMY_WEIGHT),
+            (description, DESCRIPTION_WEIGHT),
+        )
+
+
+_index = {'stamp': None, 'index': None}
+
+
+def get_title_index():
+    '''Index of all titles, rebuilt when any title changes.'''
+    stamp = version_stamp(Title.objects.all())
+    if _index['stamp'] != stamp:
+        _index['index'] = InvertedIndex(title_documents())
+        _index['stamp'] = stamp
+    return _index['index']
+
+
+def postgres_search(queryset, query):
+    from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                                SearchVector,
+                                                TrigramSimilarity)
+
+    search_query = SearchQuery(query, config=SEARCH_CONFIG)
+    vector = SearchVector('search_text', config=SEARCH_CONFIG)
+    return queryset.annotate(
+        search_vector=vector,
+        search_rank=(SearchRank(vector, search_query)
+                     + TrigramSimilarity('name', query)),
+    ).filter(
+        Q(search_vector=search_query) | Q(name__trigram_similar=query)
+    ).order_by('-search_rank', 'id')
+
+
+def index_search(queryset, query):
+    ids = get_title_index().search(query)
+    if not ids:
+        return queryset.none()
+    ranking = Case(
+        *[When(pk=pk, then=position) for position, pk in enumerate(ids)],
+        output_field=IntegerField(),
+    )
+    return queryset.filter(pk__in=ids).order_by(ranking)
+
+
+def search_titles(queryset, query):
+    '''Filter titles by name, description, genres and category and
+    order them by relevance.'''
+    if connection.vendor == 'postgresql':
+        return postgres_search(queryset, query)
+    return index_search(queryset, query)
@@ -1,6 +1,5 @@
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
-from rest_framework.generics import get_object_or_404
-from rest_framework.validators import UniqueTogetherValidator
 from reviews.models import Category, Comments, Genre, Review, Title
 from users.models import CHOICES_ROLE, User
 
@@ -46,8 +45,7 @@ class CurrentTitleDefault:
     requires_context = True
 
     def __call__(self, serializer_field):
-        return get_object_or_404(
-            Title, id=serializer_field.context['title_id'])
+        return serializer_field.context['view'].get_title()
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -68,16 +66,25 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        fields = '__all__'
+        exclude = ('modified',)
         read_only_fields = ('title',)
 
-        validators = (
-            UniqueTogetherValidator(
-                queryset=Review.objects.all(),
-                fields=('title', 'author'),
-                message=("Можно оставить только один отзыв на произведение.")
-            ),
-        )
+    def create(self, validated_data):
+        # The unique_review constraint checks uniqueness in the same query.
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            # Errors of signal handlers are not about the author.
+            if not Review.objects.filter(
+                    author=validated_data['author'],
+                    title=validated_data['title']).exists():
+                raise
+            raise serializers.ValidationError({
+                'non_field_errors': [
+                    'Можно оставить только один отзыв на произведение.'
+                ]
+            })
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -87,7 +94,7 @@ class CommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comments
-        exclude = ('review', )
+        exclude = ('review', 'modified')
         read_only_fields = ('review',)
 
 
@@ -137,6 +144,44 @@ class TitleSerializer(serializers.ModelSerializer):
         return value
 
 
-class TitleSerializerGet(TitleSerializer):
+class SparseFieldsMixin:
+    '''Leave only the fields listed in context['fields'], if given.'''
+
+    def get_fields(self):
+        fields = super().get_fields()
+        shown = self.context.get('fields')
+        if shown is None:
+            return fields
+        return {name: field for name, field in fields.items()
+                if name in shown}
+
+
+class TitleSerializerGet(SparseFieldsMixin, TitleSerializer):
     genre = GenreSerializer(many=True)
     category = CategorySerializer()
+
+
+class TitleCompactSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    rating = serializers.IntegerField(read_only=True, default=None)
+
+    class Meta:
+        model = Title
+        fields = ['id', 'name', 'year', 'rating']
+
+
+class TitleBulkSerializer(TitleSerializer):
+    '''Slugs are resolved for the whole batch at once.'''
+    genre = serializers.ListField(child=serializers.SlugField())
+    category = serializers.SlugField()
+
+
+class GenreBulkSerializer(GenreSerializer):
+    slug = serializers.SlugField(max_length=64)
+
+
+class CategoryBulkSerializer(CategorySerializer):
+    slug = serializers.SlugField(max_length=64)
+
+
+class ReviewBulkSerializer(ReviewSerializer):
+    title = serializers.IntegerField(source='title_id', min_value=1)
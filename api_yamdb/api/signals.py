@@ -0,0 +1,14 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from reviews.models import Category, Genre, Review, Title
+
+from .cache import invalidate_catalog_on_commit
+
+
+def invalidate_on_change(sender, **kwargs):
+    invalidate_catalog_on_commit()
+
+
+for model in (Title, Genre, Category, Review):
+    post_save.connect(invalidate_on_change, sender=model)
+    post_delete.connect(invalidate_on_change, sender=model)
+m2m_changed.connect(invalidate_on_change, sender=Title.genre.through)
@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class TokenBuckets:
+    '''Token buckets of one process, kept in memory.
+
+    Beyond max_size the least recently used buckets are dropped, which
+    is the same as refilling them.
+    '''
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def take(self, key, capacity, refill_rate, cost=1, now=None):
+        '''Take cost tokens at once, returns 0 or seconds until there
+        are enough.'''
+        if now is None:
+            now = time.monotonic()
+        with self.lock:
+            tokens, updated = self.buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_rate)
+            allowed = tokens >= cost
+            self.buckets[key] = (tokens - cost if allowed else tokens, now)
+            if len(self.buckets) > self.max_size:
+                self.buckets.popitem(last=False)
+        if allowed:
+            return 0
+        return (cost - tokens) / refill_rate
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+BUCKETS = TokenBuckets(settings.THROTTLE_MAX_BUCKETS)
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    '''Allows bursts of num_requests, refilled evenly over the rate
+    period, per user or per IP address for anonymous requests.
+
+    Only requests with the listed methods are throttled. Buckets are
+    per process, with several workers a client gets the rate from each
+    of them.
+    '''
+    methods = ('POST',)
+    buckets = BUCKETS
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = f'user:{request.user.pk}'
+        else:
+            ident = f'ip:{self.get_ident(request)}'
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def get_cost(self, request):
+        '''Tokens the request takes.'''
+        return 1
+
+    def allow_request(self, request, view):
+        if self.rate is None or request.method not in self.methods:
+            return True
+        cost = self.get_cost(request)
+        if cost > self.num_requests:
+            # Never fits in the bucket, waiting would not help.
+            self.wait_seconds = None
+            return False
+        self.wait_seconds = self.buckets.take(
+            self.get_cache_key(request, view), self.num_requests,
+            self.num_requests / self.duration, cost)
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class SignupThrottle(TokenBucketThrottle):
+    scope = 'signup'
+
+
+class TokenThrottle(TokenBucketThrottle):
+    scope = 'token'
+
+
+class ReviewCreateThrottle(TokenBucketThrottle):
+    scope = 'review_create'
+
+
+class BulkReviewCreateThrottle(ReviewCreateThrottle):
+    '''Shares the bucket of ReviewCreateThrottle, a token per item.'''
+
+    def get_cost(self, request):
+        items = request.data
+        return len(items) if isinstance(items, list) else 1
+
+
+class CommentCreateThrottle(TokenBucketThrottle):
+    scope = 'comment_create'
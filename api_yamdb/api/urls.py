@@ -1,9 +1,10 @@
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework import routers
 
 from .views import (CategoryViewSet, CommentsViewSet, GenreViewSet,
-                    ReviewViewSet, TitleViewSet, UserViewSet, check_token,
-                    create_user)
+                    ReviewViewSet, TitleViewSet, UserViewSet,
+                    bulk_create_reviews, check_token, create_user,
+                    database_metrics, export)
 
 app_name = 'api'
 
@@ -28,5 +29,9 @@ router.register(
 urlpatterns = [
     path('v1/', include(router.urls)),
     path('v1/auth/signup/', create_user, name='signup'),
-    path('v1/auth/token/', check_token, name='token')
+    path('v1/auth/token/', check_token, name='token'),
+    path('v1/reviews/bulk/', bulk_create_reviews, name='reviews-bulk'),
+    path('v1/metrics/db/', database_metrics, name='database-metrics'),
+    re_path(r'^v1/export/(?P<name>titles|reviews|comments)'
+            r'\.(?P<output>ndjson|csv)$', export, name='export'),
 ]
@@ -0,0 +1,131 @@
+from collections import defaultdict
+from operator import itemgetter
+
+from django.conf import settings
+from rest_framework.fields import DateTimeField
+from rest_framework.response import Response
+from reviews.models import Title
+
+format_datetime = DateTimeField().to_representation
+
+
+def format_rating(rating):
+    return None if rating is None else int(rating)
+
+
+def format_slugged(name, slug):
+    return {'name': name, 'slug': slug}
+
+
+class ValuesRepresentation:
+    '''Builds the dicts a serializer returns straight from .values()
+    rows.
+
+    lookups maps field names to the values they are made of, formats
+    maps field names to functions building the field from those values.
+    Fields without lookups are read from rows by name.
+    '''
+    lookups = {}
+    formats = {}
+
+    def __init__(self, names):
+        self.names = names
+        self.getters = []
+        for name in names:
+            lookups = self.lookups.get(name, (name,))
+            format_value = self.formats.get(name)
+            if format_value is None:
+                self.getters.append(itemgetter(*lookups))
+            else:
+                self.getters.append(self.make_getter(format_value, lookups))
+
+    @staticmethod
+    def make_getter(format_value, lookups):
+        def getter(row):
+            return format_value(*[row[lookup] for lookup in lookups])
+        return getter
+
+    def values(self, extra=()):
+        '''Lookups for queryset.values(), extra ones are also loaded.'''
+        lookups = set(extra)
+        for name in self.names:
+            lookups.update(self.lookups.get(name, ()))
+        return sorted(lookups)
+
+    def represent(self, rows):
+        fields = list(zip(self.names, self.getters))
+        return [{name: getter(row) for name, getter in fields}
+                for row in rows]
+
+
+class TitleValues(ValuesRepresentation):
+    lookups = {
+        'id': ('id',),
+        'name': ('name',),
+        'year': ('year',),
+        'rating': ('rating',),
+        'description': ('description',),
+        'category': ('category__name', 'category__slug'),
+    }
+    formats = {
+        'rating': format_rating,
+        'category': format_slugged,
+    }
+
+    def represent(self, rows):
+        rows = list(rows)
+        if 'genre' in self.names:
+            genres = defaultdict(list)
+            for title_id, name, slug in Title.genre.through.objects.filter(
+                    title_id__in=[row['id'] for row in rows]
+            ).order_by('genre_id').values_list(
+                    'title_id', 'genre__name', 'genre__slug'):
+                genres[title_id].append({'name': name, 'slug': slug})
+            for row in rows:
+                row['genre'] = genres[row['id']]
+        return super().represent(rows)
+
+
+class ReviewValues(ValuesRepresentation):
+    lookups = {
+        'id': ('id',),
+        'author': ('author__username',),
+        'text': ('text',),
+        'score': ('score',),
+        'pub_date': ('pub_date',),
+    }
+    formats = {'pub_date': format_datetime}
+
+
+class CommentValues(ValuesRepresentation):
+    lookups = {
+        'id': ('id',),
+        'author': ('author__username',),
+        'text': ('text',),
+        'pub_date': ('pub_date',),
+    }
+    formats = {'pub_date': format_datetime}
+
+
+class ValuesListMixin:
+    '''Serve lists from .values() rows instead of model serializers.
+
+    The serializer still decides which fields are shown and in what
+    order, values_class builds them. Turned off by API_VALUES_LISTS.
+    '''
+    values_class = None
+
+    def list(self, request, *args, **kwargs):
+        if not settings.API_VALUES_LISTS:
+            return super().list(request, *args, **kwargs)
+        names = [name for name, field in self.get_serializer().fields.items()
+                 if not field.write_only]
+        representation = self.values_class(names)
+        ordering = [field.lstrip('-') for field
+                    in self.pagination_class.cursor_ordering]
+        rows = self.filter_queryset(self.get_queryset()).prefetch_related(
+            None).values(*representation.values(extra=ordering))
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(representation.represent(rows))
+        return self.get_paginated_response(representation.represent(page))
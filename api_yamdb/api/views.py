@@ -1,28 +1,47 @@
+from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db.models import Max
+from django.http import Http404, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, status, viewsets
-from rest_framework.decorators import action, api_view
+from rest_framework.decorators import (action, api_view, permission_classes,
+                                       throttle_classes)
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import (SAFE_METHODS, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
-from reviews.models import Category, Genre, Review, Title
+from reviews.exports import FORMATS, export_chunks
+from reviews.leaderboards import top_title_ids
+from reviews.models import (SCORES, Category, Genre, LeaderboardEntry, Review,
+                            ScoreHistogram, Title)
+from reviews.ratings import histogram_stats
+from users.authentication import CLAIMS, ClaimsAccessToken
 from users.models import User
+from users.outbox import enqueue_email
 
+from api_yamdb.connections import METRICS, POOLS
 from api_yamdb.settings import ADMIN_EMAIL
 
+from . import bulk
+from .cache import CachedListMixin, CachedRetrieveMixin, catalog_generation
+from .conditional import ConditionalGetMixin
 from .filters import TitleFilter
+from .pagination import PubDatePagination, TitlePagination
 from .permissions import IsAdmin, IsAdminOrAuthorOrReadOnly, IsAdminOrReadOnly
+from .replicas import ReplicaReadMixin, pin_to_primary
 from .serializers import (CategorySerializer, CommentSerializer,
                           ConfirmationCodeSerializer, CreateUserSerializer,
-                          GenreSerializer, ReviewSerializer, TitleSerializer,
+                          GenreSerializer, ReviewSerializer,
+                          TitleCompactSerializer, TitleSerializer,
                           TitleSerializerGet, UserSerializer)
+from .throttling import (BulkReviewCreateThrottle, CommentCreateThrottle,
+                         ReviewCreateThrottle, SignupThrottle, TokenThrottle)
+from .values import CommentValues, ReviewValues, TitleValues, ValuesListMixin
 
 
 @api_view(['POST'])
+@throttle_classes((SignupThrottle,))
 def create_user(request):
     serializer = CreateUserSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
@@ -33,7 +52,7 @@ def create_user(request):
         username=username
     )
     confirmation_code = default_token_generator.make_token(user)
-    send_mail(
+    enqueue_email(
         'Код подтверждения Yamdb',
         f'Ваш код подтверждения: {confirmation_code}',
         ADMIN_EMAIL,
@@ -46,6 +65,7 @@ def create_user(request):
 
 
 @api_view(['POST'])
+@throttle_classes((TokenThrottle,))
 def check_token(request):
     serializer = ConfirmationCodeSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
@@ -55,7 +75,7 @@ def check_token(request):
     username = serializer.validated_data.get('username')
     user = get_object_or_404(User, username=username)
     if default_token_generator.check_token(user, confirmation_code):
-        jwt_token = AccessToken.for_user(user)
+        jwt_token = ClaimsAccessToken.for_user(user)
         return Response(
             f'Access Token: {str(jwt_token)}',
             status=status.HTTP_200_OK
@@ -66,6 +86,40 @@ def check_token(request):
     )
 
 
+@api_view(['POST'])
+@permission_classes((IsAuthenticated,))
+@throttle_classes((BulkReviewCreateThrottle,))
+def bulk_create_reviews(request):
+    saved, errors = bulk.create_reviews(bulk.get_items(request), request)
+    if saved:
+        pin_to_primary(request.user)
+    serializer = ReviewSerializer(list(saved.values()), many=True)
+    return bulk.bulk_response(
+        len(request.data), dict(zip(saved, serializer.data)), errors)
+
+
+@api_view(['GET'])
+@permission_classes((IsAuthenticated, IsAdmin))
+def export(request, name, output):
+    content_type, _ = FORMATS[output]
+    response = StreamingHttpResponse(
+        export_chunks(name, output),
+        content_type=f'{content_type}; charset=utf-8')
+    response['Content-Disposition'] = (
+        f'attachment; filename="{name}.{output}"')
+    return response
+
+
+@api_view(['GET'])
+@permission_classes((IsAuthenticated, IsAdmin))
+def database_metrics(request):
+    '''Connection counters of the worker process that answers.'''
+    return Response({
+        'connections': METRICS.as_dict(),
+        'pools': {alias: pool.as_dict() for alias, pool in POOLS.items()},
+    })
+
+
 class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -77,56 +131,79 @@ class UserViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=('get', 'patch',), url_path='me',
             permission_classes=(IsAuthenticated,))
     def my_profile(self, request):
-        user = self.request.user
-        serializer = self.get_serializer(user)
-        if request.method == 'PATCH':
-            serializer = self.get_serializer(
-                user, data=request.data, partial=True)
-            serializer.is_valid(raise_exception=True)
-            serializer.save(role=user.role)
-            return Response(serializer.data)
-        return Response(serializer.data)
+        '''Profile of the current user.
 
+        Changing the username revokes the tokens of the user, the
+        response then carries a new one in token.
+        '''
+        # request.user answers username and role from the token claims.
+        user = User.objects.get(pk=request.user.pk)
+        if request.method != 'PATCH':
+            return Response(self.get_serializer(user).data)
+        claims = [getattr(user, claim) for claim in CLAIMS]
+        serializer = self.get_serializer(
+            user, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(role=user.role)
+        data = serializer.data
+        if claims != [getattr(user, claim) for claim in CLAIMS]:
+            data['token'] = str(ClaimsAccessToken.for_user(user))
+        return Response(data)
 
-class ReviewViewSet(viewsets.ModelViewSet):
+
+class ParentObjectsMixin:
+    '''Loads the title and review from the url once per request.'''
+
+    def get_title(self):
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, pk=self.kwargs['title_id'])
+        return self._title
+
+    def get_review(self):
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review, pk=self.kwargs['review_id'],
+                title=self.kwargs['title_id'])
+        return self._review
+
+
+class ReviewViewSet(ReplicaReadMixin, ConditionalGetMixin, ParentObjectsMixin,
+                    ValuesListMixin, viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
+    values_class = ReviewValues
     permission_classes = (IsAuthenticatedOrReadOnly,
                           IsAdminOrAuthorOrReadOnly)
+    pagination_class = PubDatePagination
+    throttle_classes = (ReviewCreateThrottle,)
 
     def get_queryset(self):
-        title_id = self.kwargs['title_id']
-        title = get_object_or_404(Title, pk=title_id)
-        return title.reviews.all()
+        return self.get_title().reviews.select_related('author')
 
     def perform_create(self, serializer):
-        title_id = self.kwargs['title_id']
-        title = get_object_or_404(Title, pk=title_id)
-        serializer.save(author=self.request.user, title=title)
-
-    def get_serializer_context(self):
-        context = super().get_serializer_context()
-        context['title_id'] = self.kwargs.get('title_id')
-        return context
+        serializer.save(author=self.request.user)
 
 
-class CommentsViewSet(viewsets.ModelViewSet):
+class CommentsViewSet(ReplicaReadMixin, ConditionalGetMixin,
+                      ParentObjectsMixin, ValuesListMixin,
+                      viewsets.ModelViewSet):
     serializer_class = CommentSerializer
+    values_class = CommentValues
     permission_classes = (IsAuthenticatedOrReadOnly,
                           IsAdminOrAuthorOrReadOnly)
+    pagination_class = PubDatePagination
+    throttle_classes = (CommentCreateThrottle,)
 
     def get_queryset(self):
-        title_id = self.kwargs['title_id']
-        review_id = self.kwargs['review_id']
-        review = get_object_or_404(Review, pk=review_id, title=title_id)
-        return review.comments.all()
+        return self.get_review().comments.select_related('author')
 
     def perform_create(self, serializer):
-        review_id = self.kwargs['review_id']
-        review = get_object_or_404(Review, pk=review_id)
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.get_review())
 
 
-class GenreAndCategoryViewSet(mixins.ListModelMixin,
+class GenreAndCategoryViewSet(ReplicaReadMixin,
+                              CachedListMixin,
+                              mixins.ListModelMixin,
                               mixins.DestroyModelMixin,
                               mixins.CreateModelMixin,
                               viewsets.GenericViewSet):
@@ -134,27 +211,163 @@ class GenreAndCategoryViewSet(mixins.ListModelMixin,
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
+    leaderboard_kind = None
+    bulk_create_items = None
+
+    def get_query_int(self, name, default, max_value=None):
+        value = self.request.query_params.get(name)
+        if value is None:
+            return default
+        try:
+            value = int(value)
+        except ValueError:
+            raise ValidationError({name: ['Введите целое число.']})
+        if value < 0 or (max_value is not None and value > max_value):
+            raise ValidationError(
+                {name: [f'Значение должно быть от 0 до {max_value}.']})
+        return value
+
+    @action(detail=False, methods=('post',))
+    def bulk(self, request):
+        saved, errors = self.bulk_create_items(bulk.get_items(request))
+        serializer = self.get_serializer(list(saved.values()), many=True)
+        return bulk.bulk_response(
+            len(request.data), dict(zip(saved, serializer.data)), errors)
+
+    @action(detail=True, methods=('get',))
+    def top(self, request, slug=None):
+        title_ids = top_title_ids(
+            self.leaderboard_kind, slug,
+            min_reviews=self.get_query_int(
+                'min_reviews', settings.LEADERBOARD_MIN_REVIEWS),
+            bayesian=request.query_params.get('bayesian') == 'true',
+            limit=self.get_query_int(
+                'limit', settings.LEADERBOARD_SIZE,
+                settings.LEADERBOARD_MAX_SIZE),
+        )
+        if not title_ids:
+            self.get_object()
+            return Response([])
+        titles = Title.objects.select_related('category').prefetch_related(
+            'genre').in_bulk(title_ids)
+        serializer = TitleSerializerGet(
+            [titles[title_id] for title_id in title_ids], many=True)
+        return Response(serializer.data)
 
 
 class GenreViewSet(GenreAndCategoryViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    leaderboard_kind = LeaderboardEntry.GENRE
+    bulk_create_items = staticmethod(bulk.create_genres)
 
 
 class CategoryViewSet(GenreAndCategoryViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    leaderboard_kind = LeaderboardEntry.CATEGORY
+    bulk_create_items = staticmethod(bulk.create_categories)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')).order_by('id')
+class TitleViewSet(ReplicaReadMixin, ConditionalGetMixin, CachedListMixin,
+                   CachedRetrieveMixin, ValuesListMixin,
+                   viewsets.ModelViewSet):
+    queryset = Title.objects.select_related('category').prefetch_related(
+        'genre').order_by('id')
     serializer_class = TitleSerializer
+    values_class = TitleValues
     permission_classes = (IsAdminOrReadOnly,)
+    pagination_class = TitlePagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
 
+    def list_version(self, queryset):
+        # Any filtered list of titles changes with the whole catalog.
+        # Changes through the API move the catalog generation, csvload
+        # writes straight to the database and moves the latest modified.
+        modified = Title.objects.aggregate(
+            modified=Max('modified'))['modified']
+        return '{}:{}'.format(
+            catalog_generation(), modified.isoformat() if modified else '')
+
     def get_serializer_class(self):
         if self.request.method not in SAFE_METHODS:
             return TitleSerializer
+        if self.request.query_params.get('compact') == 'true':
+            return TitleCompactSerializer
         return TitleSerializerGet
+
+    def get_shown_fields(self):
+        '''Fields left by ?fields= and ?omit=, all fields by default.'''
+        if hasattr(self, '_shown_fields'):
+            return self._shown_fields
+        fields = list(self.get_serializer_class().Meta.fields)
+        for param in ('fields', 'omit'):
+            value = self.request.query_params.get(param)
+            if value is None:
+                continue
+            names = {name.strip() for name in value.split(',')} - {''}
+            unknown = names - set(fields)
+            if unknown:
+                raise ValidationError({param: [
+                    f'Неизвестные поля: {", ".join(sorted(unknown))}.']})
+            fields = [name for name in fields
+                      if (name in names) == (param == 'fields')]
+        self._shown_fields = fields
+        return fields
+
+    def get_queryset(self):
+        if self.request.method not in SAFE_METHODS:
+            return super().get_queryset()
+        fields = self.get_shown_fields()
+        columns = [name for name in fields
+                   if name not in ('genre', 'category')]
+        queryset = Title.objects.order_by('id')
+        if 'category' in fields:
+            queryset = queryset.select_related('category')
+            columns += ['category', 'category__name', 'category__slug']
+        if 'genre' in fields:
+            queryset = queryset.prefetch_related('genre')
+        return queryset.only(*columns)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.method in SAFE_METHODS:
+            context['fields'] = self.get_shown_fields()
+        return context
+
+    @action(detail=False, methods=('post', 'patch'))
+    def bulk(self, request):
+        items = bulk.get_items(request)
+        if request.method == 'PATCH':
+            saved, errors = bulk.update_titles(items)
+            success = status.HTTP_200_OK
+        else:
+            saved, errors = bulk.create_titles(items)
+            success = status.HTTP_201_CREATED
+        titles = self.get_queryset().in_bulk(
+            [title.pk for title in saved.values()])
+        serializer = TitleSerializerGet(
+            [titles[title.pk] for title in saved.values()], many=True)
+        return bulk.bulk_response(
+            len(items), dict(zip(saved, serializer.data)), errors, success)
+
+    @action(detail=True, methods=('get',))
+    def stats(self, request, pk=None):
+        try:
+            pk = int(pk)
+        except ValueError:
+            raise Http404
+        histogram = ScoreHistogram.objects.filter(title_id=pk).first()
+        if histogram is None:
+            get_object_or_404(Title, pk=pk)
+            counts = [0] * len(SCORES)
+        else:
+            counts = histogram.counts
+        review_count, mean, median = histogram_stats(counts)
+        return Response({
+            'review_count': review_count,
+            'mean': mean,
+            'median': median,
+            'distribution': dict(zip(map(str, SCORES), counts)),
+        })
@@ -0,0 +1,199 @@
+import os
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+class ConnectionMetrics:
+    '''Per process counters of database connection use.'''
+
+    FIELDS = ('requests', 'reused', 'connects', 'health_checks',
+              'health_check_failures')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.counters = dict.fromkeys(self.FIELDS, 0)
+
+    def add(self, name, value=1):
+        with self.lock:
+            self.counters[name] += value
+
+    def as_dict(self):
+        with self.lock:
+            return dict(self.counters)
+
+
+METRICS = ConnectionMetrics()
+
+
+class PoolTimeoutError(Exception):
+    pass
+
+
+class ConnectionPool:
+    '''Thread safe pool of database connections.
+
+    connect opens a new connection, check tells whether an idle one still
+    works. Idle connections are checked before reuse when they have been
+    idle for check_interval seconds or more.
+    '''
+
+    def __init__(self, connect, check, max_size=10, timeout=10,
+                 check_interval=30):
+        self.connect = connect
+        self.check = check
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self.idle = deque()
+        self.size = 0
+        self.condition = threading.Condition()
+        self.stats = dict.fromkeys(
+            ('opened', 'reused', 'discarded', 'waits', 'timeouts'), 0)
+        self.stats.update(wait_seconds=0.0, max_wait_seconds=0.0)
+
+    def count(self, name, value=1):
+        with self.condition:
+            self.stats[name] += value
+
+    def acquire(self):
+        started = time.monotonic()
+        with self.condition:
+            waited = False
+            while not self.idle and self.size >= self.max_size:
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self.stats['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f'No free connection in {self.timeout} s.')
+                waited = True
+                self.condition.wait(remaining)
+            if waited:
+                wait = time.monotonic() - started
+                self.stats['waits'] += 1
+                self.stats['wait_seconds'] += wait
+                self.stats['max_wait_seconds'] = max(
+                    self.stats['max_wait_seconds'], wait)
+            if self.idle:
+                connection, released = self.idle.pop()
+            else:
+                connection = None
+                self.size += 1
+        if connection is not None:
+            if (time.monotonic() - released < self.check_interval
+                    or self.check(connection)):
+                self.count('reused')
+                return connection
+            # The slot stays taken by the connection opened instead.
+            self.discard(connection)
+        try:
+            connection = self.connect()
+        except Exception:
+            self.release(None)
+            raise
+        self.count('opened')
+        return connection
+
+    def release(self, connection, discard=False):
+        '''Give a connection back, discarded ones are closed.'''
+        if connection is not None and discard:
+            self.discard(connection)
+            connection = None
+        with self.condition:
+            if connection is None:
+                self.size -= 1
+            else:
+                self.idle.append((connection, time.monotonic()))
+            self.condition.notify()
+
+    def close_idle(self):
+        with self.condition:
+            idle = [connection for connection, _ in self.idle]
+            self.idle.clear()
+            self.size -= len(idle)
+            self.condition.notify_all()
+        for connection in idle:
+            self.discard(connection)
+
+    def discard(self, connection):
+        self.count('discarded')
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def as_dict(self):
+        with self.condition:
+            return dict(self.stats, size=self.size, idle=len(self.idle),
+                        max_size=self.max_size)
+
+
+POOLS = {}
+POOLS_LOCK = threading.Lock()
+
+
+def get_pool(alias, connect, check, **options):
+    '''The pool of a database alias, created on first use.'''
+    with POOLS_LOCK:
+        if alias not in POOLS:
+            POOLS[alias] = ConnectionPool(connect, check, **options)
+        return POOLS[alias]
+
+
+def close_pools():
+    '''Close idle pooled connections, e.g. before forking.'''
+    with POOLS_LOCK:
+        pools = list(POOLS.values())
+    for pool in pools:
+        pool.close_idle()
+
+
+def forget_pools():
+    '''Drop pools inherited by a forked process without closing their
+    connections, their sockets still belong to the parent.'''
+    global POOLS_LOCK
+    POOLS_LOCK = threading.Lock()
+    POOLS.clear()
+
+
+os.register_at_fork(after_in_child=forget_pools)
+
+
+@receiver(connection_created)
+def count_connect(sender, connection, **kwargs):
+    METRICS.add('connects')
+
+
+@receiver(request_started)
+def check_connections(sender, **kwargs):
+    '''Close persistent connections that stopped working.
+
+    Runs after close_old_connections of Django, checks a connection once
+    per DB_HEALTH_CHECK_INTERVAL seconds at most.
+    '''
+    METRICS.add('requests')
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is None:
+            continue
+        METRICS.add('reused')
+        checked = getattr(connection, 'health_checked_at', None)
+        if (checked is not None
+                and now - checked < settings.DB_HEALTH_CHECK_INTERVAL):
+            continue
+        METRICS.add('health_checks')
+        if connection.is_usable():
+            connection.health_checked_at = now
+        else:
+            METRICS.add('health_check_failures')
+            connection.close()
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+from api_yamdb.connections import get_pool
+
+
+def check_connection(connection):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        if (connection.get_transaction_status()
+                != extensions.TRANSACTION_STATUS_IDLE):
+            connection.rollback()
+    except base.Database.Error:
+        return False
+    return True
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    '''PostgreSQL backend taking connections from a pool shared by the
+    threads of a process.
+
+    The POOL key of the database settings may set MAX_SIZE and TIMEOUT,
+    the seconds to wait for a free connection. Use it with CONN_MAX_AGE
+    = 0, so connections go back to the pool after each request.
+    '''
+
+    def get_pool(self, conn_params):
+        options = self.settings_dict.get('POOL', {})
+        return get_pool(
+            self.alias,
+            connect=lambda: super(DatabaseWrapper, self).get_new_connection(
+                conn_params),
+            check=check_connection,
+            max_size=options.get('MAX_SIZE', 10),
+            timeout=options.get('TIMEOUT', 10),
+            check_interval=settings.DB_HEALTH_CHECK_INTERVAL,
+        )
+
+    def get_new_connection(self, conn_params):
+        self.pool = self.get_pool(conn_params)
+        return self.pool.acquire()
+
+    def _close(self):
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            self.release_connection()
+
+    def release_connection(self):
+        connection = self.connection
+        status = connection.get_transaction_status()
+        broken = (connection.closed
+                  or status == extensions.TRANSACTION_STATUS_UNKNOWN)
+        if not broken and status != extensions.TRANSACTION_STATUS_IDLE:
+            connection.rollback()
+        self.pool.release(connection, discard=broken)
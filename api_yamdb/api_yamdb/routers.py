@@ -0,0 +1,39 @@
+import random
+import threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+state = threading.local()
+
+
+def use_replica():
+    '''Send reads of the current thread to a random replica, if any.'''
+    replicas = settings.DATABASE_REPLICAS
+    state.alias = random.choice(replicas) if replicas else None
+    return state.alias
+
+
+def use_primary():
+    state.alias = None
+
+
+def reading_from_replica():
+    return getattr(state, 'alias', None) is not None
+
+
+class ReplicaRouter:
+    '''Reads go to the replica chosen by use_replica, writes always go to
+    the primary database.'''
+
+    def db_for_read(self, model, **hints):
+        return getattr(state, 'alias', None)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -21,6 +21,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt',
     'django_filters',
@@ -68,9 +69,69 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD'),
         'HOST': os.getenv('DB_HOST', default='db'),
         'PORT': os.getenv('DB_PORT', default='5432'),
+        # Seconds to keep a connection between requests, 0 closes it after
+        # every request. With the api_yamdb.postgresql_pool engine set it
+        # to 0 and size the pool instead.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', default=60)),
+        'POOL': {
+            'MAX_SIZE': int(os.getenv('DB_POOL_MAX_SIZE', default=10)),
+            'TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', default=10)),
+        },
     }
 }
 
+# Comma separated hosts of read replicas, for SQLite paths of database
+# files. Safe requests of the catalog, reviews and comments read from one
+# of them, users who changed something read from the primary database for
+# DB_REPLICA_STICKY_SECONDS.
+DATABASE_REPLICAS = []
+for number, replica_host in enumerate(
+        filter(None, os.getenv('DB_REPLICA_HOSTS', default='').split(',')),
+        start=1):
+    replica = dict(DATABASES['default'], TEST={'MIRROR': 'default'})
+    if replica['ENGINE'] == 'django.db.backends.sqlite3':
+        replica['NAME'] = replica_host.strip()
+    else:
+        replica['HOST'] = replica_host.strip()
+    DATABASES[f'replica_{number}'] = replica
+    DATABASE_REPLICAS.append(f'replica_{number}')
+
+DATABASE_ROUTERS = ['api_yamdb.routers.ReplicaRouter']
+
+# Longer than the usual replication lag. Pins are kept in the default
+# cache, with several workers use a shared backend for it.
+DB_REPLICA_STICKY_SECONDS = int(
+    os.getenv('DB_REPLICA_STICKY_SECONDS', default=10))
+
+# Reused connections are checked with SELECT 1 at most this often.
+DB_HEALTH_CHECK_INTERVAL = int(
+    os.getenv('DB_HEALTH_CHECK_INTERVAL', default=30))
+
+CACHES = {
+    # Replica pins and the token denylist. Keep it shared between all
+    # processes serving the API, e.g. FileBasedCache on a common volume.
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', default=''),
+    },
+    # Responses of read-only catalog endpoints. LocMemCache evicts least
+    # recently used entries; with several workers use a shared backend,
+    # e.g. FileBasedCache or a Redis cache, so invalidation reaches all.
+    'api': {
+        'BACKEND': os.getenv(
+            'API_CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('API_CACHE_LOCATION', default='api'),
+        'TIMEOUT': int(os.getenv('API_CACHE_TIMEOUT', default=300)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('API_CACHE_MAX_ENTRIES',
+                                         default=1000)),
+        },
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.'
@@ -110,22 +171,61 @@ AUTH_USER_MODEL = 'users.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.ClaimsJWTAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
     'DEFAULT_PAGINATION_CLASS':
         'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    # nginx appends the client address to X-Forwarded-For, only that last
+    # address is trusted.
+    'NUM_PROXIES': 1,
+    # Token buckets: the number of requests a client can make at once,
+    # refilled evenly over the period. An empty value turns a scope off.
+    'DEFAULT_THROTTLE_RATES': {
+        'signup': os.getenv('THROTTLE_SIGNUP_RATE', default='5/min') or None,
+        'token': os.getenv('THROTTLE_TOKEN_RATE', default='10/min') or None,
+        'review_create': os.getenv(
+            'THROTTLE_REVIEW_CREATE_RATE', default='30/min') or None,
+        'comment_create': os.getenv(
+            'THROTTLE_COMMENT_CREATE_RATE', default='60/min') or None,
+    },
 }
 
+THROTTLE_MAX_BUCKETS = 100000
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=7),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Revoked tokens are kept in the default cache for this long, with
+# several workers use a shared backend for it so revocation is immediate.
+JWT_DENYLIST_CACHE_SECONDS = int(
+    os.getenv('JWT_DENYLIST_CACHE_SECONDS', default=30))
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'static/emails/')
 ADMIN_EMAIL = 'admin@yamdb.ru'
 
+# Emails wait in the outbox table until the send_emails command sends
+# them. A failed email is retried after EMAIL_OUTBOX_RETRY_DELAY seconds,
+# the delay doubles after every failure.
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 8
+EMAIL_OUTBOX_RETRY_DELAY = 30
+EMAIL_OUTBOX_MAX_RETRY_DELAY = 3600
+EMAIL_OUTBOX_LEASE = 300
+
 
 MIN_LEN_USERNAME = 2
+LEADERBOARD_MIN_REVIEWS = 1
+LEADERBOARD_BAYESIAN_WEIGHT = 10
+LEADERBOARD_SIZE = 10
+LEADERBOARD_MAX_SIZE = 100
+API_VALUES_LISTS = True
+BULK_MAX_ITEMS = 1000
 THIS_YEAR = date.today().year
@@ -0,0 +1,30 @@
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', default='0.0.0.0:8000')
+
+# Threads let a worker serve other requests while one waits for
+# postgres, without a process per concurrent request.
+#
+# One process by default: response caches, replica pins, the token
+# denylist, throttle buckets and connection pools live in its memory.
+# Before adding workers point CACHE_BACKEND and API_CACHE_BACKEND to a
+# shared cache; throttle limits then apply per worker. Every thread may
+# hold a database connection, keep workers * threads well below
+# max_connections of postgres (100 by default).
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', default='gthread')
+workers = int(os.getenv('GUNICORN_WORKERS', default=1))
+threads = int(os.getenv(
+    'GUNICORN_THREADS', default=min(multiprocessing.cpu_count() * 4, 32)))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', default=30))
+graceful_timeout = 30
+# nginx keeps connections to the upstream open.
+keepalive = 5
+
+# Recycle workers now and then so memory does not creep up.
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', default=2000))
+max_requests_jitter = max_requests // 10
+
+# Heartbeat files on tmpfs, a docker overlay disk can stall workers.
+worker_tmp_dir = '/dev/shm'
@@ -0,0 +1,71 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .leaderboards import update_title_entries
+from .models import Review, Title
+from .ratings import rebuild_title_stats
+from .search import update_search_text
+
+
+def bulk_insert(model, objs):
+    '''bulk_create that also sets primary keys on backends without
+    RETURNING. Call it inside a transaction.'''
+    model.objects.bulk_create(objs)
+    if objs and objs[0].pk is None:
+        # SQLite holds the write lock until the transaction ends, so the
+        # new rows are the last ones.
+        pks = list(model.objects.order_by('-pk').values_list(
+            'pk', flat=True)[:len(objs)])
+        for obj, pk in zip(objs, reversed(pks)):
+            obj.pk = pk
+    return objs
+
+
+def refresh_titles(titles):
+    '''Refresh data titles copy from their genres and category.'''
+    update_search_text(titles)
+    update_title_entries(titles)
+
+
+def set_genres(genre_ids):
+    '''Replace genres of titles, genre_ids maps title id to genre ids.'''
+    through = Title.genre.through
+    through.objects.filter(title_id__in=genre_ids).delete()
+    through.objects.bulk_create(
+        through(title_id=title_id, genre_id=genre_id)
+        for title_id, ids in genre_ids.items() for genre_id in ids
+    )
+
+
+def create_titles(titles, genre_ids):
+    '''Insert titles with their genres, genre_ids holds a list of genre
+    ids for every title.'''
+    with transaction.atomic():
+        bulk_insert(Title, titles)
+        set_genres({title.pk: ids for title, ids in zip(titles, genre_ids)})
+        refresh_titles(Title.objects.filter(
+            pk__in=[title.pk for title in titles]))
+    return titles
+
+
+def update_titles(titles, fields, genre_ids):
+    '''Save fields of titles and replace genres of titles in genre_ids.'''
+    now = timezone.now()
+    for title in titles:
+        title.modified = now
+    with transaction.atomic():
+        Title.objects.bulk_update(titles, [*fields, 'modified'])
+        set_genres(genre_ids)
+        refresh_titles(Title.objects.filter(
+            pk__in=[title.pk for title in titles]))
+    return titles
+
+
+def create_reviews(reviews):
+    with transaction.atomic():
+        bulk_insert(Review, reviews)
+        titles = Title.objects.filter(
+            pk__in={review.title_id for review in reviews})
+        rebuild_title_stats(titles)
+        update_title_entries(titles)
+    return reviews
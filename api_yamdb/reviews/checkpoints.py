@@ -0,0 +1,38 @@
+import json
+import os
+
+
+class Checkpoint:
+    '''Progress of a table import stored next to the csv files.'''
+
+    def __init__(self, directory, table, source):
+        self.path = os.path.join(directory, f'{table}.json')
+        self.source = source
+
+    def source_state(self):
+        stat = os.stat(self.source)
+        return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    def load(self):
+        '''Return saved progress if it belongs to the current csv file.'''
+        try:
+            with open(self.path) as file:
+                state = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return None
+        if state.get('source') != self.source_state():
+            return None
+        return state
+
+    def save(self, rows, position, done=False):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        state = {
+            'source': self.source_state(),
+            'rows': rows,
+            'position': position,
+            'done': done,
+        }
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump(state, file)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,115 @@
+import csv
+from datetime import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Comments, Review, Title
+
+CHUNK_SIZE = 2000
+LINES_PER_CHUNK = 500
+
+
+def title_rows():
+    '''Titles with their genre slugs.
+
+    Genres are read by a second cursor in the same title order, so
+    neither side is kept in memory.
+    '''
+    titles = Title.objects.order_by('id').values_list(
+        'id', 'name', 'year', 'description', 'category__slug', 'rating',
+        'review_count',
+    ).iterator(chunk_size=CHUNK_SIZE)
+    genres = Title.genre.through.objects.order_by(
+        'title_id', 'genre_id'
+    ).values_list('title_id', 'genre__slug').iterator(chunk_size=CHUNK_SIZE)
+    genre = next(genres, None)
+    for title in titles:
+        slugs = []
+        while genre is not None and genre[0] <= title[0]:
+            if genre[0] == title[0]:
+                slugs.append(genre[1])
+            genre = next(genres, None)
+        yield (*title[:5], slugs, *title[5:])
+
+
+def review_rows():
+    return Review.objects.order_by('id').values_list(
+        'id', 'title_id', 'author__username', 'text', 'score', 'pub_date',
+    ).iterator(chunk_size=CHUNK_SIZE)
+
+
+def comment_rows():
+    return Comments.objects.order_by('id').values_list(
+        'id', 'review__title_id', 'review_id', 'author__username', 'text',
+        'pub_date',
+    ).iterator(chunk_size=CHUNK_SIZE)
+
+
+class Export:
+    '''Columns of an export and a function yielding its rows.'''
+
+    def __init__(self, fields, rows):
+        self.fields = fields
+        self.rows = rows
+
+
+EXPORTS = {
+    'titles': Export(
+        ('id', 'name', 'year', 'description', 'category', 'genre',
+         'rating', 'review_count'),
+        title_rows),
+    'reviews': Export(
+        ('id', 'title_id', 'author', 'text', 'score', 'pub_date'),
+        review_rows),
+    'comments': Export(
+        ('id', 'title_id', 'review_id', 'author', 'text', 'pub_date'),
+        comment_rows),
+}
+
+
+def ndjson_lines(fields, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(fields, row))) + '\n'
+
+
+class Echo:
+    '''File-like object handing back what csv.writer writes.'''
+
+    def write(self, value):
+        return value
+
+
+def csv_value(value):
+    if isinstance(value, list):
+        return ','.join(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def csv_lines(fields, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([csv_value(value) for value in row])
+
+
+FORMATS = {
+    'ndjson': ('application/x-ndjson', ndjson_lines),
+    'csv': ('text/csv', csv_lines),
+}
+
+
+def export_chunks(name, output):
+    '''Text of an export in chunks of LINES_PER_CHUNK lines.'''
+    export = EXPORTS[name]
+    _, lines = FORMATS[output]
+    chunk = []
+    for line in lines(export.fields, export.rows()):
+        chunk.append(line)
+        if len(chunk) == LINES_PER_CHUNK:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
@@ -0,0 +1,135 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (ExpressionWrapper, F, FloatField, OuterRef,
+                              Subquery, Sum, Value)
+
+from .models import LeaderboardEntry, Title
+
+BATCH_SIZE = 1000
+
+
+def bayesian_rating(score_sum, review_count, prior_mean):
+    '''Average score pulled towards prior_mean for titles with few
+    reviews.'''
+    if prior_mean is None:
+        return None
+    weight = settings.LEADERBOARD_BAYESIAN_WEIGHT
+    return (score_sum + weight * prior_mean) / (review_count + weight)
+
+
+def current_prior_mean():
+    totals = Title.objects.aggregate(
+        score_sum=Sum('score_sum'), review_count=Sum('review_count'))
+    if not totals['review_count']:
+        return None
+    return totals['score_sum'] / totals['review_count']
+
+
+def title_entries(title, genre_slugs, prior_mean):
+    values = {
+        'title_id': title['id'],
+        'rating': title['rating'],
+        'bayesian_rating': bayesian_rating(
+            title['score_sum'], title['review_count'], prior_mean),
+        'prior_mean': prior_mean,
+        'review_count': title['review_count'],
+    }
+    yield LeaderboardEntry(kind=LeaderboardEntry.CATEGORY,
+                           slug=title['category__slug'], **values)
+    for slug in genre_slugs:
+        yield LeaderboardEntry(kind=LeaderboardEntry.GENRE, slug=slug,
+                               **values)
+
+
+def create_entries(titles, prior_mean):
+    titles = titles.values(
+        'id', 'rating', 'score_sum', 'review_count', 'category__slug'
+    ).order_by('id')
+    created = 0
+    last_id = 0
+    while True:
+        chunk = list(titles.filter(id__gt=last_id)[:BATCH_SIZE])
+        if not chunk:
+            return created
+        genres = defaultdict(list)
+        for title_id, slug in Title.genre.through.objects.filter(
+                title_id__in=[title['id'] for title in chunk]
+        ).values_list('title_id', 'genre__slug'):
+            genres[title_id].append(slug)
+        entries = [
+            entry for title in chunk
+            for entry in title_entries(
+                title, genres[title['id']], prior_mean)
+        ]
+        LeaderboardEntry.objects.bulk_create(entries)
+        created += len(entries)
+        last_id = chunk[-1]['id']
+
+
+def refresh_leaderboards():
+    '''Rebuild all genre and category leaderboards, returns the number
+    of entries.'''
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+        return create_entries(Title.objects.all(), current_prior_mean())
+
+
+def bayesian_update(prior_mean):
+    '''Update kwargs copying the rating of the title of each entry.'''
+    title = Title.objects.filter(pk=OuterRef('title_id'))
+    score_sum = Subquery(title.values('score_sum'))
+    review_count = Subquery(title.values('review_count'))
+    weight = settings.LEADERBOARD_BAYESIAN_WEIGHT
+    return {
+        'rating': Subquery(title.values('rating')),
+        'review_count': review_count,
+        'bayesian_rating': ExpressionWrapper(
+            (score_sum + weight * prior_mean) / (review_count + weight),
+            output_field=FloatField(),
+        ),
+    }
+
+
+def update_title_entries(titles):
+    '''Recreate entries of titles whose genres or category changed.
+
+    The prior mean is kept from the last full refresh. Entries made
+    while there were no reviews at all get the current one.
+    '''
+    prior_mean = LeaderboardEntry.objects.filter(
+        prior_mean__isnull=False
+    ).values_list('prior_mean', flat=True).first()
+    if prior_mean is None:
+        prior_mean = current_prior_mean()
+    LeaderboardEntry.objects.filter(title__in=titles).delete()
+    if prior_mean is not None:
+        LeaderboardEntry.objects.filter(prior_mean__isnull=True).update(
+            prior_mean=prior_mean, **bayesian_update(
+                Value(prior_mean, output_field=FloatField())))
+    create_entries(titles, prior_mean)
+
+
+def update_leaderboards(title_id):
+    '''Copy the current rating of a title to its leaderboard entries.'''
+    updated = LeaderboardEntry.objects.filter(
+        title_id=title_id, prior_mean__isnull=False
+    ).update(**bayesian_update(F('prior_mean')))
+    if not updated:
+        update_title_entries(Title.objects.filter(pk=title_id))
+
+
+def top_title_ids(kind, slug, min_reviews=None, bayesian=False,
+                  limit=None):
+    '''Ids of the best rated titles of a genre or category.'''
+    if min_reviews is None:
+        min_reviews = settings.LEADERBOARD_MIN_REVIEWS
+    if limit is None:
+        limit = settings.LEADERBOARD_SIZE
+    order = F('bayesian_rating' if bayesian else 'rating').desc(
+        nulls_last=True)
+    return list(LeaderboardEntry.objects.filter(
+        kind=kind, slug=slug, review_count__gte=max(min_reviews, 1),
+    ).order_by(order, 'title_id').values_list(
+        'title_id', flat=True)[:limit])
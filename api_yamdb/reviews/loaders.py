@@ -0,0 +1,279 @@
+import time
+from contextlib import contextmanager
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from users.models import User
+
+from .checkpoints import Checkpoint
+from .leaderboards import refresh_leaderboards
+from .models import Category, Comments, Genre, Review, Title
+from .parsers.csv_parsers import csv_parse, csv_path, optional_int
+from .ratings import rebuild_title_stats
+from .search import update_search_text
+
+
+def build_category(fields):
+    return Category(
+        id=fields['id'],
+        name=fields['name'],
+        slug=fields['slug'],
+    )
+
+
+def build_genre(fields):
+    return Genre(
+        id=fields['id'],
+        name=fields['name'],
+        slug=fields['slug'],
+    )
+
+
+def build_titles(fields):
+    return Title(
+        id=fields['id'],
+        name=fields['name'],
+        year=fields['year'],
+        category_id=fields['category'],
+    )
+
+
+def build_review(fields):
+    return Review(
+        id=fields['id'],
+        text=fields['text'],
+        score=fields['score'],
+        title_id=fields['title_id'],
+        author_id=fields['author'],
+        pub_date=fields['pub_date'],
+    )
+
+
+def build_comments(fields):
+    return Comments(
+        id=fields['id'],
+        text=fields['text'],
+        pub_date=fields['pub_date'],
+        review_id=fields['review_id'],
+        author_id=fields['author'],
+    )
+
+
+def build_users(fields):
+    return User(
+        id=fields['id'],
+        username=fields['username'],
+        email=fields['email'],
+        role=fields['role'],
+        bio=fields['bio'],
+        first_name=fields['first_name'],
+        last_name=fields['last_name'],
+    )
+
+
+def build_genre_title(fields):
+    return Title.genre.through(
+        id=fields['id'],
+        title_id=fields['title_id'],
+        genre_id=fields['genre_id'],
+    )
+
+
+# Rebuilds of data derived from the tables, in the order they run.
+DERIVED_DATA = (update_search_text, rebuild_title_stats, refresh_leaderboards)
+
+
+class Table:
+    '''How rows of one csv file become objects of one model.
+
+    after_load lists the rebuilds of DERIVED_DATA the table feeds.
+    '''
+
+    def __init__(self, model, build, types, references=None,
+                 after_load=()):
+        self.model = model
+        self.build = build
+        self.types = types
+        self.references = references or {}
+        self.after_load = after_load
+
+
+TABLES = {
+    'users': Table(User, build_users, {'id': int}),
+    'category': Table(Category, build_category, {'id': int}),
+    'genre': Table(Genre, build_genre, {'id': int}),
+    'titles': Table(Title, build_titles,
+                    {'id': int, 'year': int, 'category': int},
+                    references={'category_id': Category},
+                    after_load=(update_search_text,)),
+    'genre_title': Table(Title.genre.through, build_genre_title,
+                         {'id': int, 'title_id': int, 'genre_id': int},
+                         references={'title_id': Title, 'genre_id': Genre},
+                         after_load=(update_search_text,
+                                     refresh_leaderboards)),
+    'review': Table(Review, build_review,
+                    {'id': int, 'title_id': int, 'author': int,
+                     'score': optional_int},
+                    references={'title_id': Title, 'author_id': User},
+                    after_load=(rebuild_title_stats,
+                                refresh_leaderboards)),
+    'comments': Table(Comments, build_comments,
+                      {'id': int, 'review_id': int, 'author': int},
+                      references={'review_id': Review, 'author_id': User}),
+}
+
+
+def refresh_derived_data(names):
+    '''Run the rebuilds the tables feed, each once.
+
+    Run them after every table of the load is in place, a rebuild
+    reading a table still being loaded leaves stale data behind.
+    '''
+    hooks = {hook for name in names for hook in TABLES[name].after_load}
+    for hook in DERIVED_DATA:
+        if hook in hooks:
+            hook()
+
+
+@contextmanager
+def keep_auto_now_add(model):
+    '''Let bulk_create store pub_date values taken from the file.'''
+    fields = [field for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now_add', False)]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def reset_sequence(model):
+    statements = connection.ops.sequence_reset_sql(no_style(), [model])
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+class LoadStats:
+
+    def __init__(self, offset=0):
+        self.started = time.monotonic()
+        self.finished = None
+        self.offset = offset
+        self.rows = 0
+        self.loaded = 0
+        self.skipped = 0
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def rate(self):
+        elapsed = self.elapsed
+        return self.rows / elapsed if elapsed else 0.0
+
+    @property
+    def total(self):
+        return self.offset + self.rows
+
+
+def load_table(name, batches, report=None, checkpoint=None, offset=0,
+               after_load=True):
+    '''Insert batches of csv rows of a table with bulk_create.
+
+    Rows pointing to missing foreign keys are skipped, rows with ids
+    already present in the database are ignored, so a batch loaded
+    twice after a crash does not duplicate anything. Without
+    after_load the caller runs refresh_derived_data itself.
+    '''
+    table = TABLES[name]
+    known_ids = {
+        model: set(model.objects.values_list('pk', flat=True))
+        for model in set(table.references.values())
+    }
+    stats = LoadStats(offset)
+    with keep_auto_now_add(table.model):
+        for batch in batches:
+            objs = []
+            for fields in batch:
+                obj = table.build(fields)
+                if all(getattr(obj, attname) in known_ids[model]
+                       for attname, model in table.references.items()):
+                    objs.append(obj)
+            with transaction.atomic():
+                table.model.objects.bulk_create(objs, ignore_conflicts=True)
+            stats.rows += len(batch)
+            stats.loaded += len(objs)
+            stats.skipped += len(batch) - len(objs)
+            if checkpoint:
+                checkpoint.save(stats.total, batches.position)
+            if report:
+                report(name, stats)
+    reset_sequence(table.model)
+    if after_load:
+        refresh_derived_data([name])
+    stats.finished = time.monotonic()
+    if checkpoint:
+        checkpoint.save(stats.total, batches.position, done=True)
+    return stats
+
+
+def load_file(name, batch_size, directory=None, report=None,
+              checkpoint_dir=None, resume=False, after_load=True):
+    '''Load a csv file, saving progress to checkpoint_dir if given.
+
+    With resume, a finished table is skipped and an unfinished one
+    continues right after the last committed batch.
+    '''
+    start, offset, checkpoint = None, 0, None
+    if checkpoint_dir:
+        checkpoint = Checkpoint(
+            checkpoint_dir, name, csv_path(name, directory))
+        state = checkpoint.load() if resume else None
+        if state and state['done']:
+            stats = LoadStats(state['rows'])
+            stats.finished = stats.started
+            return stats
+        if state:
+            start, offset = state['position'], state['rows']
+    batches = csv_parse(
+        name, batch_size, TABLES[name].types, directory, start)
+    return load_table(name, batches, report, checkpoint, offset,
+                      after_load)
+
+
+def table_dependencies():
+    '''Map every table to the tables its foreign keys point to.'''
+    names = {table.model: name for name, table in TABLES.items()}
+    return {
+        name: {
+            names[field.related_model]
+            for field in table.model._meta.concrete_fields
+            if field.is_relation and field.related_model in names
+            and field.related_model is not table.model
+        }
+        for name, table in TABLES.items()
+    }
+
+
+def dependency_levels(names):
+    '''Split tables into groups that can be loaded at the same time.
+
+    Each group depends only on the groups before it. Dependencies that
+    are not among names are expected to be loaded already.
+    '''
+    dependencies = table_dependencies()
+    pending = set(names)
+    levels = []
+    while pending:
+        level = sorted(name for name in pending
+                       if not dependencies[name] & pending)
+        if not level:
+            raise ValueError(f'Circular dependency between {pending}')
+        levels.append(level)
+        pending -= set(level)
+    return levels
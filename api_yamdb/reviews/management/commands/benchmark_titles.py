@@ -0,0 +1,70 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from reviews.models import Category, Title
+
+BATCH_SIZE = 10000
+PAGE_SIZE = 10
+
+CASES = {
+    'year icontains (old filter)': {'year__icontains': 1994},
+    'year exact': {'year': 1994},
+    'year range': {'year__gte': 1990, 'year__lte': 1995},
+    'year in': {'year__in': [1972, 1994, 2010]},
+    'year and category': {'year': 1994, 'category__slug': 'category-3'},
+}
+
+
+class Command(BaseCommand):
+    '''Measure title list queries on generated titles.
+
+    Titles are created inside a transaction that is rolled back at the
+    end unless --keep is given.
+    '''
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=1000000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--keep', action='store_true',
+                            help='Keep generated titles.')
+
+    def seed(self, count):
+        categories = [
+            Category.objects.get_or_create(
+                slug=f'category-{number}',
+                defaults={'name': f'Категория {number}'})[0]
+            for number in range(10)
+        ]
+        started = time.monotonic()
+        random.seed(0)
+        for offset in range(0, count, BATCH_SIZE):
+            Title.objects.bulk_create(
+                Title(name=f'Произведение {number}',
+                      year=random.randint(1900, 2022),
+                      category=random.choice(categories))
+                for number in range(offset, min(offset + BATCH_SIZE, count))
+            )
+        self.stdout.write(
+            f'{count} titles created in {time.monotonic() - started:.1f} s')
+
+    def measure(self, lookups, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            queryset = Title.objects.filter(**lookups).order_by('id')
+            queryset.count()
+            list(queryset.values_list('id', flat=True)[:PAGE_SIZE])
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        return timings[len(timings) // 2]
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(options['titles'])
+            for name, lookups in CASES.items():
+                median = self.measure(lookups, options['repeat'])
+                self.stdout.write(f'{name:30} {median * 1000:9.2f} ms')
+            if not options['keep']:
+                transaction.set_rollback(True)
@@ -1,106 +1,108 @@
-from django.core.management.base import BaseCommand
-from reviews.models import Category, Comments, Genre, Review, Title
-from reviews.parsers.csv_parsers import csv_parse
-from users.models import User
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from reviews.loaders import (TABLES, dependency_levels, load_file,
+                             refresh_derived_data)
+from reviews.parsers.csv_parsers import DEFAULT_BATCH_SIZE, DIR, csv_path
 
-def create_category(fields_list):
-    for fields in fields_list:
-        Category.objects.get_or_create(
-            name=fields['name'],
-            slug=fields['slug'],
-        )
-
-
-def create_genre(fields_list):
-    for fields in fields_list:
-        Genre.objects.get_or_create(
-            name=fields['name'],
-            slug=fields['slug'],
-        )
-
-
-def create_titles(fields_list):
-    for fields in fields_list:
-        category = Category.objects.filter(pk=fields['category']).first()
-        Title.objects.get_or_create(
-            name=fields['name'],
-            year=fields['year'],
-            category=category,
-        )
-
-
-def create_review(fields_list):
-    for fields in fields_list:
-        title = Title.objects.filter(pk=fields['title_id']).first()
-        author = User.objects.filter(pk=fields['author']).first()
-        Review.objects.get_or_create(
-            text=fields['text'],
-            score=fields['score'],
-            title=title,
-            pub_date=fields['pub_date'],
-            author=author,
-        )
-
-
-def create_comments(fields_list):
-    for fields in fields_list:
-        review = Review.objects.filter(pk=fields['review_id']).first()
-        Comments.objects.get_or_create(
-            text=fields['text'],
-            pub_date=fields['pub_date'],
-            review=review,
-        )
-
-
-def create_users(fields_list):
-    for fields in fields_list:
-        User.objects.get_or_create(
-            id=fields['id'],
-            username=fields['username'],
-            email=fields['email'],
-            role=fields['role'],
-            bio=fields['bio'],
-            first_name=fields['first_name'],
-            last_name=fields['last_name'],
-        )
-
-
-def create_genre_title(fields_list):
-    for fields in fields_list:
-        title = Title.objects.filter(pk=fields['title_id']).first()
-        genre = Genre.objects.filter(pk=fields['genre_id']).first()
-        title.genre.add(genre)
+from api_yamdb.connections import close_pools
 
 
 class Command(BaseCommand):
     '''Load data from csv file.'''
 
     def add_arguments(self, parser):
-        parser.add_argument('filename')
+        parser.add_argument('filename', nargs='?')
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help='Number of rows inserted in one transaction.')
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Load every known table found in the data directory.')
+        parser.add_argument(
+            '--data-dir', default=None,
+            help='Directory with csv files, static/data by default.')
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Number of processes loading independent tables.')
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Continue interrupted imports from their checkpoints.')
+        parser.add_argument(
+            '--checkpoint-dir', default=None,
+            help='Directory for checkpoints, data directory/checkpoints '
+                 'by default.')
+
+    def report(self, name, stats):
+        self.stdout.write(
+            f'{name}: {stats.total} rows, {stats.skipped} skipped, '
+            f'{stats.rate:.0f} rows/s'
+        )
+
+    def load_options(self, options):
+        checkpoint_dir = options['checkpoint_dir'] or os.path.join(
+            options['data_dir'] or DIR, 'checkpoints')
+        return {
+            'batch_size': options['batch_size'],
+            'directory': options['data_dir'],
+            'checkpoint_dir': checkpoint_dir,
+            'resume': options['resume'],
+        }
 
     def handle(self, *args, **options):
+        if options['all']:
+            self.load_directory(options)
+            return
         filename = options['filename']
-        fields_list = csv_parse(filename)
-        if not fields_list:
+        if filename is None:
+            raise CommandError('Pass a table name or --all.')
+        if filename not in TABLES:
             self.stdout.write(self.style.ERROR(
-                f'file {filename}.csv not exist'
-            ))
-
-        commands = {
-            'category': create_category,
-            'genre': create_genre,
-            'titles': create_titles,
-            'review': create_review,
-            'comments': create_comments,
-            'users': create_users,
-            'genre_title': create_genre_title,
-        }
-
+                f'Table {filename} is not exist'))
+            return
         try:
-            commands.get(filename)(fields_list)
-            self.stdout.write(self.style.SUCCESS(
-                f'Data in "{filename}" table is created.'))
-        except TypeError:
+            stats = load_file(filename, report=self.report,
+                              **self.load_options(options))
+        except FileNotFoundError:
             self.stdout.write(self.style.ERROR(
-                f'Table {filename} is not exist'))
+                f'file {filename}.csv not exist'
+            ))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Data in "{filename}" table is created: {stats.loaded} rows '
+            f'loaded at {stats.rate:.0f} rows/s.'))
+
+    def load_directory(self, options):
+        names = [name for name in TABLES
+                 if os.path.exists(csv_path(name, options['data_dir']))]
+        if not names:
+            raise CommandError('No csv files to load.')
+        started = time.monotonic()
+        for level in dependency_levels(names):
+            for name, stats in self.load_level(level, options):
+                self.stdout.write(self.style.SUCCESS(
+                    f'Data in "{name}" table is created: {stats.loaded} '
+                    f'rows loaded at {stats.rate:.0f} rows/s.'))
+        # Tables of one level load at the same time, derived data is
+        # rebuilt once all of them are in.
+        refresh_derived_data(names)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(names)} tables loaded in '
+            f'{time.monotonic() - started:.1f} s.'))
+
+    def load_level(self, level, options):
+        kwargs = self.load_options(options)
+        kwargs['after_load'] = False
+        workers = min(options['workers'], len(level))
+        if workers <= 1:
+            return [(name, load_file(name, **kwargs)) for name in level]
+        # Forked workers must open their own database connections.
+        connections.close_all()
+        close_pools()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [(name, pool.submit(load_file, name, **kwargs))
+                       for name in level]
+            return [(name, future.result()) for name, future in futures]
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from reviews.exports import EXPORTS, FORMATS, export_chunks
+
+
+class Command(BaseCommand):
+    '''Stream titles, reviews or comments to a file as NDJSON or csv.'''
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=EXPORTS)
+        parser.add_argument('--format', dest='output', choices=FORMATS,
+                            default='ndjson')
+        parser.add_argument('--output', dest='path', default=None,
+                            help='File to write, stdout by default.')
+
+    def handle(self, *args, **options):
+        chunks = export_chunks(options['name'], options['output'])
+        if options['path'] is None:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        with open(options['path'], 'w', encoding='utf-8',
+                  newline='') as file:
+            for chunk in chunks:
+                file.write(chunk)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from reviews.ratings import rebuild_title_stats
+
+
+class Command(BaseCommand):
+    '''Rebuild stored title ratings and score histograms from reviews.'''
+
+    def handle(self, *args, **options):
+        updated = rebuild_title_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f'Ratings and histograms of {updated} titles are rebuilt.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from reviews.leaderboards import refresh_leaderboards
+
+
+class Command(BaseCommand):
+    '''Rebuild top rated titles of every genre and category.'''
+
+    def handle(self, *args, **options):
+        created = refresh_leaderboards()
+        self.stdout.write(self.style.SUCCESS(
+            f'Leaderboards are refreshed: {created} entries.'))
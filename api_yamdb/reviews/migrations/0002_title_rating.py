@@ -0,0 +1,52 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:58
+
+from django.db import migrations, models
+from django.db.models import (Avg, Count, FloatField, IntegerField, OuterRef,
+                              Subquery, Sum)
+from django.db.models.functions import Coalesce
+
+
+def fill_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+
+    def aggregate(expression, output_field):
+        reviews = Review.objects.filter(
+            title=OuterRef('pk'), score__isnull=False
+        ).order_by().values('title')
+        return Subquery(
+            reviews.annotate(value=expression).values('value'),
+            output_field=output_field,
+        )
+
+    Title.objects.update(
+        score_sum=Coalesce(aggregate(Sum('score'), IntegerField()), 0),
+        review_count=Coalesce(aggregate(Count('score'), IntegerField()), 0),
+        rating=aggregate(Avg('score'), FloatField()),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Рейтинг произведения'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
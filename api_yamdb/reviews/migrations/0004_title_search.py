@@ -0,0 +1,56 @@
+# Generated by Django 2.2.16 on 2026-10-18 06:06
+
+from django.db import migrations, models
+
+POSTGRES_INDEXES = (
+    ('reviews_title_search_text_fts',
+     "USING gin (to_tsvector('simple'::regconfig, "
+     "COALESCE(search_text, '')))"),
+    ('reviews_title_name_trgm', 'USING gin (name gin_trgm_ops)'),
+)
+
+
+def fill_search_text(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    titles = Title.objects.select_related('category').prefetch_related(
+        'genre')
+    for title in titles:
+        words = [title.name, title.category.name]
+        words.extend(genre.name for genre in title.genre.all())
+        words.append(title.description)
+        title.search_text = ' '.join(word for word in words if word)
+    Title.objects.bulk_update(titles, ['search_text'], batch_size=1000)
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, definition in POSTGRES_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON reviews_title '
+            f'{definition}')
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _ in POSTGRES_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_modified'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='search_text',
+            field=models.TextField(blank=True, editable=False, verbose_name='Текст для поиска'),
+        ),
+        migrations.RunPython(fill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
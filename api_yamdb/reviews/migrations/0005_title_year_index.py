@@ -0,0 +1,17 @@
+# Generated by Django 2.2.16 on 2026-10-18 06:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year', 'category'], name='title_year_category_idx'),
+        ),
+    ]
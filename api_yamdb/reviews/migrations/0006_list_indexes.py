@@ -0,0 +1,55 @@
+# Generated by Django 2.2.16 on 2026-10-18 06:09
+
+from django.db import migrations, models
+
+INDEXES = (
+    ('comments', models.Index(fields=['review', 'id'],
+                              name='comment_review_id_idx')),
+    ('comments', models.Index(fields=['review', 'pub_date'],
+                              name='comment_review_pub_date_idx')),
+    ('review', models.Index(fields=['title', 'id'],
+                            name='review_title_id_idx')),
+    ('review', models.Index(fields=['title', 'pub_date'],
+                            name='review_title_pub_date_idx')),
+    ('title', models.Index(fields=['category', 'id'],
+                           name='title_category_id_idx')),
+)
+
+
+def add_indexes(apps, schema_editor):
+    # Reviews and comments are large, on postgres build the indexes
+    # without blocking writes.
+    for model_name, index in INDEXES:
+        model = apps.get_model('reviews', model_name)
+        if schema_editor.connection.vendor == 'postgresql':
+            sql = str(index.create_sql(model, schema_editor)).replace(
+                'CREATE INDEX', 'CREATE INDEX CONCURRENTLY IF NOT EXISTS', 1)
+            schema_editor.execute(sql)
+        else:
+            schema_editor.add_index(model, index)
+
+
+def remove_indexes(apps, schema_editor):
+    for model_name, index in INDEXES:
+        schema_editor.remove_index(
+            apps.get_model('reviews', model_name), index)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('reviews', '0005_title_year_index'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name=model_name, index=index)
+                for model_name, index in INDEXES
+            ],
+            database_operations=[
+                migrations.RunPython(add_indexes, remove_indexes),
+            ],
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 2.2.16 on 2026-10-18 06:11
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+import django.db.models.deletion
+
+SCORES = range(1, 11)
+
+
+def fill_histograms(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    ScoreHistogram = apps.get_model('reviews', 'ScoreHistogram')
+    counts = Review.objects.filter(score__in=SCORES).order_by().values(
+        'title').annotate(**{
+            f'score_{score}': Count('pk', filter=Q(score=score))
+            for score in SCORES
+        })
+    ScoreHistogram.objects.bulk_create(
+        [ScoreHistogram(title_id=row.pop('title'), **row) for row in counts],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreHistogram',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='histogram', serialize=False, to='reviews.Title', verbose_name='Произведение')),
+                ('score_1', models.PositiveIntegerField(default=0)),
+                ('score_2', models.PositiveIntegerField(default=0)),
+                ('score_3', models.PositiveIntegerField(default=0)),
+                ('score_4', models.PositiveIntegerField(default=0)),
+                ('score_5', models.PositiveIntegerField(default=0)),
+                ('score_6', models.PositiveIntegerField(default=0)),
+                ('score_7', models.PositiveIntegerField(default=0)),
+                ('score_8', models.PositiveIntegerField(default=0)),
+                ('score_9', models.PositiveIntegerField(default=0)),
+                ('score_10', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Распределение оценок',
+                'verbose_name_plural': 'Распределения оценок',
+            },
+        ),
+        migrations.RunPython(fill_histograms, migrations.RunPython.noop),
+    ]
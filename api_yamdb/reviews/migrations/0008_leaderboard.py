@@ -0,0 +1,76 @@
+# Generated by Django 2.2.16 on 2026-10-18 06:13
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+import django.db.models.deletion
+
+
+def fill_leaderboards(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    LeaderboardEntry = apps.get_model('reviews', 'LeaderboardEntry')
+    totals = Title.objects.aggregate(
+        score_sum=Sum('score_sum'), review_count=Sum('review_count'))
+    prior_mean = None
+    if totals['review_count']:
+        prior_mean = totals['score_sum'] / totals['review_count']
+    weight = settings.LEADERBOARD_BAYESIAN_WEIGHT
+    genres = defaultdict(list)
+    for title_id, slug in Title.genre.through.objects.values_list(
+            'title_id', 'genre__slug'):
+        genres[title_id].append(slug)
+    entries = []
+    for title in Title.objects.values(
+            'id', 'rating', 'score_sum', 'review_count', 'category__slug'):
+        values = {
+            'title_id': title['id'],
+            'rating': title['rating'],
+            'bayesian_rating': None if prior_mean is None else (
+                (title['score_sum'] + weight * prior_mean)
+                / (title['review_count'] + weight)),
+            'prior_mean': prior_mean,
+            'review_count': title['review_count'],
+        }
+        entries.append(LeaderboardEntry(
+            kind='category', slug=title['category__slug'], **values))
+        entries.extend(LeaderboardEntry(kind='genre', slug=slug, **values)
+                       for slug in genres[title['id']])
+    LeaderboardEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_score_histogram'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('genre', 'Жанр'), ('category', 'Категория')], max_length=16, verbose_name='Тип рейтинга')),
+                ('slug', models.SlugField(db_index=False, max_length=64, verbose_name='Идентификатор жанра или категории')),
+                ('rating', models.FloatField(null=True, verbose_name='Рейтинг')),
+                ('bayesian_rating', models.FloatField(null=True, verbose_name='Байесовский рейтинг')),
+                ('prior_mean', models.FloatField(null=True, verbose_name='Средняя оценка по всем')),
+                ('review_count', models.PositiveIntegerField(default=0, verbose_name='Количество оценок')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='reviews.Title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Место в рейтинге',
+                'verbose_name_plural': 'Места в рейтинге',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['kind', 'slug', '-rating', 'title'], name='leaderboard_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['kind', 'slug', '-bayesian_rating', 'title'], name='leaderboard_bayesian_idx'),
+        ),
+        migrations.RunPython(fill_leaderboards, migrations.RunPython.noop),
+    ]
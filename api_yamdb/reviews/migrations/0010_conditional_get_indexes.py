@@ -0,0 +1,26 @@
+# Generated by Django 2.2.16 on 2026-10-18 07:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_pub_date_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='title',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Дата изменения'),
+        ),
+        migrations.AddIndex(
+            model_name='comments',
+            index=models.Index(fields=['review', 'modified'], name='comment_review_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', 'modified'], name='review_title_modified_idx'),
+        ),
+    ]
@@ -5,6 +5,8 @@ from users.models import User
 
 from api_yamdb.settings import THIS_YEAR
 
+SCORES = range(1, 11)
+
 
 class Category(models.Model):
     name = models.CharField(max_length=64,
@@ -49,6 +51,17 @@ class Title(models.Model):
     year = models.IntegerField(verbose_name='Год выхода произведения')
     description = models.TextField(blank=True,
                                    verbose_name='Описание произведения')
+    rating = models.FloatField(null=True, blank=True, editable=False,
+                               verbose_name='Рейтинг произведения')
+    review_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Количество оценок')
+    score_sum = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Сумма оценок')
+    modified = models.DateTimeField(auto_now=True,
+                                    db_index=True,
+                                    verbose_name='Дата изменения')
+    search_text = models.TextField(blank=True, editable=False,
+                                   verbose_name='Текст для поиска')
 
     def clean(self):
         if not 0 < self.year <= THIS_YEAR:
@@ -63,6 +76,41 @@ class Title(models.Model):
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ['id']
+        indexes = [
+            models.Index(fields=['year', 'category'],
+                         name='title_year_category_idx'),
+            models.Index(fields=['category', 'id'],
+                         name='title_category_id_idx'),
+        ]
+
+
+class ScoreHistogram(models.Model):
+    title = models.OneToOneField(Title,
+                                 on_delete=models.CASCADE,
+                                 primary_key=True,
+                                 related_name='histogram',
+                                 verbose_name='Произведение')
+    score_1 = models.PositiveIntegerField(default=0)
+    score_2 = models.PositiveIntegerField(default=0)
+    score_3 = models.PositiveIntegerField(default=0)
+    score_4 = models.PositiveIntegerField(default=0)
+    score_5 = models.PositiveIntegerField(default=0)
+    score_6 = models.PositiveIntegerField(default=0)
+    score_7 = models.PositiveIntegerField(default=0)
+    score_8 = models.PositiveIntegerField(default=0)
+    score_9 = models.PositiveIntegerField(default=0)
+    score_10 = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Распределение оценок'
+        verbose_name_plural = 'Распределения оценок'
+
+    def __str__(self):
+        return str(self.title_id)
+
+    @property
+    def counts(self):
+        return [getattr(self, f'score_{score}') for score in SCORES]
 
 
 class Review(models.Model):
@@ -86,11 +134,21 @@ class Review(models.Model):
     pub_date = models.DateTimeField(auto_now_add=True,
                                     db_index=True,
                                     verbose_name='Дата добавления')
+    modified = models.DateTimeField(auto_now=True,
+                                    verbose_name='Дата изменения')
 
     class Meta:
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         ordering = ['id']
+        indexes = [
+            models.Index(fields=['title', 'id'],
+                         name='review_title_id_idx'),
+            models.Index(fields=['title', 'pub_date', 'id'],
+                         name='review_title_pub_date_id_idx'),
+            models.Index(fields=['title', 'modified'],
+                         name='review_title_modified_idx'),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['author', 'title'],
@@ -111,6 +169,8 @@ class Comments(models.Model):
     pub_date = models.DateTimeField(auto_now_add=True,
                                     db_index=True,
                                     verbose_name='Дата добавления')
+    modified = models.DateTimeField(auto_now=True,
+                                    verbose_name='Дата изменения')
     review = models.ForeignKey(Review,
                                on_delete=models.CASCADE,
                                related_name='comments',
@@ -120,6 +180,52 @@ class Comments(models.Model):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ['id']
+        indexes = [
+            models.Index(fields=['review', 'id'],
+                         name='comment_review_id_idx'),
+            models.Index(fields=['review', 'pub_date', 'id'],
+                         name='comment_review_pub_date_id_idx'),
+            models.Index(fields=['review', 'modified'],
+                         name='comment_review_modified_idx'),
+        ]
 
     def __str__(self):
         return self.text
+
+
+class LeaderboardEntry(models.Model):
+    GENRE = 'genre'
+    CATEGORY = 'category'
+    KINDS = (
+        (GENRE, 'Жанр'),
+        (CATEGORY, 'Категория'),
+    )
+
+    kind = models.CharField(max_length=16, choices=KINDS,
+                            verbose_name='Тип рейтинга')
+    slug = models.SlugField(max_length=64, db_index=False,
+                            verbose_name='Идентификатор жанра или категории')
+    title = models.ForeignKey(Title,
+                              on_delete=models.CASCADE,
+                              related_name='leaderboard_entries',
+                              verbose_name='Произведение')
+    rating = models.FloatField(null=True, verbose_name='Рейтинг')
+    bayesian_rating = models.FloatField(null=True,
+                                        verbose_name='Байесовский рейтинг')
+    prior_mean = models.FloatField(null=True,
+                                   verbose_name='Средняя оценка по всем')
+    review_count = models.PositiveIntegerField(
+        default=0, verbose_name='Количество оценок')
+
+    class Meta:
+        verbose_name = 'Место в рейтинге'
+        verbose_name_plural = 'Места в рейтинге'
+        indexes = [
+            models.Index(fields=['kind', 'slug', '-rating', 'title'],
+                         name='leaderboard_rating_idx'),
+            models.Index(fields=['kind', 'slug', '-bayesian_rating', 'title'],
+                         name='leaderboard_bayesian_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} {self.slug}: {self.title_id}'
@@ -1,17 +1,71 @@
 import csv
+import os
 import sys
+from itertools import islice
 
 DIR = sys.path[0] + '/static/data/'
+DEFAULT_BATCH_SIZE = 1000
 
 
-def csv_parse(filename):
-    csv_path = DIR + filename + '.csv'
-    fields_list = []
-    try:
-        with open(csv_path, 'r', newline='') as csvfile:
-            csv_reader = csv.DictReader(csvfile)
-            for row in csv_reader:
-                fields_list.append(row)
-        return fields_list
-    except FileNotFoundError:
-        return None
+def csv_path(filename, directory=None):
+    return os.path.join(directory or DIR, filename + '.csv')
+
+
+def optional_int(value):
+    return int(value) if value else None
+
+
+def coerce_row(row, types):
+    for key, convert in types.items():
+        if key in row:
+            row[key] = convert(row[key])
+    return row
+
+
+def lines(csvfile):
+    # readline() instead of iteration keeps csvfile.tell() available.
+    line = csvfile.readline()
+    while line:
+        yield line
+        line = csvfile.readline()
+
+
+class CsvBatches:
+    '''Iterator over lists of at most batch_size rows of a csv file.
+
+    After each batch, position holds the file offset right behind it;
+    passing it back as start continues reading from there.
+    '''
+
+    def __init__(self, csvfile, batch_size, types=None, start=None):
+        self.csvfile = csvfile
+        self.batch_size = batch_size
+        self.types = types
+        self.start = start
+        self.position = None
+
+    def __iter__(self):
+        with self.csvfile:
+            fieldnames = next(csv.reader(lines(self.csvfile)), None)
+            if self.start is not None:
+                self.csvfile.seek(self.start)
+            rows = csv.DictReader(lines(self.csvfile), fieldnames)
+            if self.types:
+                rows = (coerce_row(row, self.types) for row in rows)
+            batch = list(islice(rows, self.batch_size))
+            while batch:
+                self.position = self.csvfile.tell()
+                yield batch
+                batch = list(islice(rows, self.batch_size))
+
+
+def csv_parse(filename, batch_size=DEFAULT_BATCH_SIZE, types=None,
+              directory=None, start=None):
+    '''Iterate over lists of at most batch_size rows of a csv file.
+
+    Only one batch is kept in memory. Values of the columns listed in
+    types are converted with the given callables. Raises
+    FileNotFoundError right away if the file does not exist.
+    '''
+    csvfile = open(csv_path(filename, directory), 'r', newline='')
+    return CsvBatches(csvfile, batch_size, types, start)
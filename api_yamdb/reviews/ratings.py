@@ -0,0 +1,124 @@
+from itertools import islice
+
+from django.db import connection
+from django.db.models import (Avg, Count, ExpressionWrapper, F, FloatField,
+                              IntegerField, OuterRef, Q, Subquery, Sum)
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
+
+from .leaderboards import update_leaderboards
+from .models import SCORES, Review, ScoreHistogram, Title
+
+BATCH_SIZE = 1000
+
+
+def update_title_rating(title_id, score_delta, count_delta):
+    '''Apply a change of review scores to the stored title rating.'''
+    score_sum = F('score_sum') + score_delta
+    review_count = F('review_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        score_sum=score_sum,
+        review_count=review_count,
+        rating=ExpressionWrapper(
+            Cast(score_sum, FloatField()) / NullIf(review_count, 0),
+            output_field=FloatField(),
+        ),
+        modified=timezone.now(),
+    )
+
+
+def update_histogram(title_id, score, delta):
+    if score not in SCORES:
+        return
+    field = f'score_{score}'
+    if delta < 0:
+        ScoreHistogram.objects.filter(title_id=title_id).update(
+            **{field: F(field) + delta})
+        return
+    # Insert the row or bump the counter in one statement, supported by
+    # postgres and SQLite 3.24+.
+    table = connection.ops.quote_name(ScoreHistogram._meta.db_table)
+    columns = [f'score_{value}' for value in SCORES]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (title_id, {", ".join(columns)}) '
+            f'VALUES (%s, {", ".join(["%s"] * len(columns))}) '
+            f'ON CONFLICT (title_id) DO UPDATE '
+            f'SET {field} = {table}.{field} + %s',
+            [title_id] + [delta if column == field else 0
+                          for column in columns] + [delta],
+        )
+
+
+def add_score(title_id, score, sign=1):
+    '''Count a review score in the title stats, or out with sign=-1.'''
+    update_title_rating(title_id, sign * score, sign)
+    update_histogram(title_id, score, sign)
+    update_leaderboards(title_id)
+
+
+def histogram_stats(counts):
+    '''Number, mean and median of scores given counts of 1 to 10.'''
+    total = sum(counts)
+    if not total:
+        return 0, None, None
+    mean = sum(score * count for score, count in zip(SCORES, counts)) / total
+
+    def nth_score(position):
+        for score, count in zip(SCORES, counts):
+            if position < count:
+                break
+            position -= count
+        return score
+
+    median = (nth_score((total - 1) // 2) + nth_score(total // 2)) / 2
+    return total, mean, median
+
+
+def _review_aggregate(aggregate, output_field):
+    reviews = Review.objects.filter(
+        title=OuterRef('pk'), score__isnull=False
+    ).order_by().values('title')
+    return Subquery(
+        reviews.annotate(value=aggregate).values('value'),
+        output_field=output_field,
+    )
+
+
+def rebuild_title_ratings(queryset=None):
+    '''Recalculate stored ratings from the reviews table.'''
+    if queryset is None:
+        queryset = Title.objects.all()
+    return queryset.update(
+        score_sum=Coalesce(
+            _review_aggregate(Sum('score'), IntegerField()), 0),
+        review_count=Coalesce(
+            _review_aggregate(Count('score'), IntegerField()), 0),
+        rating=_review_aggregate(Avg('score'), FloatField()),
+        modified=timezone.now(),
+    )
+
+
+def rebuild_histograms(queryset=None):
+    '''Recalculate score histograms from the reviews table.'''
+    if queryset is None:
+        queryset = Title.objects.all()
+    ScoreHistogram.objects.filter(title__in=queryset).delete()
+    counts = Review.objects.filter(
+        title__in=queryset, score__in=SCORES
+    ).order_by().values('title').annotate(**{
+        f'score_{score}': Count('pk', filter=Q(score=score))
+        for score in SCORES
+    })
+    histograms = (ScoreHistogram(title_id=row.pop('title'), **row)
+                  for row in counts.iterator())
+    batch = list(islice(histograms, BATCH_SIZE))
+    while batch:
+        ScoreHistogram.objects.bulk_create(batch)
+        batch = list(islice(histograms, BATCH_SIZE))
+
+
+def rebuild_title_stats(queryset=None):
+    '''Recalculate ratings and histograms, returns number of titles.'''
+    rebuild_histograms(queryset)
+    return rebuild_title_ratings(queryset)
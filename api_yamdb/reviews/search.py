@@ -0,0 +1,38 @@
+from django.utils import timezone
+
+from .models import Title
+
+CHUNK_SIZE = 1000
+
+
+def build_search_text(title):
+    words = [title.name, title.category.name if title.category else '']
+    words.extend(genre.name for genre in title.genre.all())
+    words.append(title.description)
+    return ' '.join(word for word in words if word)
+
+
+def update_search_text(titles=None):
+    '''Refresh search_text of titles whose names, genres or category
+    changed. Returns the number of updated titles.'''
+    if titles is None:
+        titles = Title.objects.all()
+    titles = titles.select_related('category').prefetch_related(
+        'genre').order_by('pk')
+    updated = 0
+    last_pk = 0
+    while True:
+        chunk = list(titles.filter(pk__gt=last_pk)[:CHUNK_SIZE])
+        if not chunk:
+            return updated
+        changed = []
+        now = timezone.now()
+        for title in chunk:
+            text = build_search_text(title)
+            if text != title.search_text:
+                title.search_text = text
+                title.modified = now
+                changed.append(title)
+        Title.objects.bulk_update(changed, ['search_text', 'modified'])
+        updated += len(changed)
+        last_pk = chunk[-1].pk
@@ -0,0 +1,98 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_init,
+                                      post_save, pre_delete)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .bulk import refresh_titles
+from .models import Category, Genre, Review, Title
+from .ratings import add_score, rebuild_title_stats
+
+
+def _score_state(review):
+    if 'score' not in review.__dict__ or 'title_id' not in review.__dict__:
+        return None
+    return review.title_id, review.score
+
+
+def _rebuild(*title_ids):
+    rebuild_title_stats(Title.objects.filter(pk__in=title_ids))
+
+
+@receiver(post_init, sender=Review)
+def remember_review_score(sender, instance, **kwargs):
+    instance._saved_score_state = _score_state(instance)
+
+
+@receiver(post_save, sender=Review)
+def update_stats_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_state = (None, None) if created else instance._saved_score_state
+    new_state = _score_state(instance)
+    instance._saved_score_state = new_state
+    if old_state is None or new_state is None:
+        _rebuild(instance.title_id)
+        return
+    if old_state == new_state:
+        return
+    old_title_id, old_score = old_state
+    new_title_id, new_score = new_state
+    if old_score is not None:
+        add_score(old_title_id, old_score, -1)
+    if new_score is not None:
+        add_score(new_title_id, new_score)
+
+
+@receiver(post_delete, sender=Review)
+def update_stats_on_delete(sender, instance, **kwargs):
+    state = instance._saved_score_state
+    if state is None:
+        _rebuild(instance.title_id)
+        return
+    title_id, score = state
+    if score is not None:
+        add_score(title_id, score, -1)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Genre)
+def touch_titles(sender, instance, created=False, raw=False, **kwargs):
+    '''Titles embed genre and category names, so they change too.'''
+    if created or raw:
+        return
+    titles = Title.objects.filter(**{sender._meta.model_name: instance})
+    if kwargs.get('signal') is pre_delete:
+        instance._title_ids = list(titles.values_list('pk', flat=True))
+    else:
+        refresh_titles(titles)
+    titles.update(modified=timezone.now())
+
+
+@receiver(post_delete, sender=Genre)
+def update_titles_without_genre(sender, instance, **kwargs):
+    refresh_titles(Title.objects.filter(pk__in=instance._title_ids))
+
+
+@receiver(post_save, sender=Title)
+def update_title_search_text(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_titles(Title.objects.filter(pk=instance.pk))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def update_genres_search_text(sender, instance, action, reverse, pk_set,
+                              **kwargs):
+    if action == 'pre_clear' and reverse:
+        instance._title_ids = list(
+            instance.titles.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        title_ids = [instance.pk]
+    elif action == 'post_clear':
+        title_ids = instance._title_ids
+    else:
+        title_ids = pk_set
+    refresh_titles(Title.objects.filter(pk__in=title_ids))
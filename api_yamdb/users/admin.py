@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import User
+from .models import OutgoingEmail, User
 
 
 @admin.register(User)
@@ -9,3 +9,11 @@ class UserAdmin(admin.ModelAdmin):
                     'last_name', 'email', 'role')
     search_fields = ('username', 'email', 'role')
     list_filter = ('role',)
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'subject', 'to', 'created', 'attempts',
+                    'next_attempt_at', 'sent_at')
+    search_fields = ('to',)
+    list_filter = ('sent_at',)
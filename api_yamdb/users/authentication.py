@@ -0,0 +1,126 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import TokenRevocation, User, UserRole
+
+CLAIMS = ('username', 'role', 'is_superuser')
+ISSUED_CLAIM = 'issued_at'
+DENYLIST_KEY = 'auth:denylist'
+
+
+class ClaimsAccessToken(AccessToken):
+    '''Access token carrying what permissions need to know of the user.'''
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in CLAIMS:
+            token[claim] = getattr(user, claim)
+        # iat is in whole seconds, revocations need the exact time.
+        token[ISSUED_CLAIM] = timezone.now().timestamp()
+        return token
+
+
+def revoke_tokens(user_id):
+    '''Reject every token the user got so far.'''
+    TokenRevocation.objects.update_or_create(
+        user_id=user_id, defaults={'revoked_at': timezone.now()})
+    cache.delete(DENYLIST_KEY)
+
+
+def get_denylist():
+    '''Revocation times by user id, cached for
+    JWT_DENYLIST_CACHE_SECONDS.
+
+    Tokens live ACCESS_TOKEN_LIFETIME, older revocations do not matter.
+    '''
+    denylist = cache.get(DENYLIST_KEY)
+    if denylist is None:
+        since = timezone.now() - api_settings.ACCESS_TOKEN_LIFETIME
+        denylist = {
+            user_id: revoked_at.timestamp()
+            for user_id, revoked_at in TokenRevocation.objects.filter(
+                revoked_at__gt=since).values_list('user_id', 'revoked_at')
+        }
+        cache.set(DENYLIST_KEY, denylist, settings.JWT_DENYLIST_CACHE_SECONDS)
+    return denylist
+
+
+def is_revoked(token):
+    '''Tokens issued before the last revocation of their user.
+
+    Tokens without the issued_at claim count as issued before any
+    revocation.
+    '''
+    revoked_at = get_denylist().get(token[api_settings.USER_ID_CLAIM])
+    return (revoked_at is not None
+            and token.get(ISSUED_CLAIM, 0) < revoked_at)
+
+
+def load_user(user_id):
+    try:
+        return User.objects.get(pk=user_id)
+    except User.DoesNotExist:
+        raise AuthenticationFailed('Пользователь не найден.',
+                                   code='user_not_found')
+
+
+class ClaimsUser(SimpleLazyObject):
+    '''User built from token claims.
+
+    Claims answer permission checks, anything else loads the user from
+    the database on first use.
+    '''
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+
+    def __init__(self, token):
+        user_id = token[api_settings.USER_ID_CLAIM]
+        super().__init__(lambda: load_user(user_id))
+        self.__dict__['claims'] = {claim: token[claim] for claim in CLAIMS}
+        self.__dict__['pk'] = self.__dict__['id'] = user_id
+
+    @property
+    def username(self):
+        return self.claims['username']
+
+    @property
+    def role(self):
+        return self.claims['role']
+
+    @property
+    def is_superuser(self):
+        return self.claims['is_superuser']
+
+    @property
+    def is_admin(self):
+        return self.role == UserRole.ADMIN
+
+    @property
+    def is_moderator(self):
+        return self.role == UserRole.MODERATOR
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    '''JWT authentication without a user query per request.
+
+    Tokens with claims become ClaimsUser, unless the user was changed,
+    deleted or deactivated after the token was issued. Tokens without
+    claims load the user from the database.
+    '''
+
+    def get_user(self, validated_token):
+        if not all(claim in validated_token for claim
+                   in (api_settings.USER_ID_CLAIM, *CLAIMS)):
+            return super().get_user(validated_token)
+        if is_revoked(validated_token):
+            raise AuthenticationFailed('Токен отозван.',
+                                       code='token_revoked')
+        return ClaimsUser(validated_token)
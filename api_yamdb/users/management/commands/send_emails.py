@@ -0,0 +1,38 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from users.outbox import send_due_emails
+
+
+class Command(BaseCommand):
+    '''Send emails waiting in the outbox.'''
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help='Number of emails sent over one connection.')
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep running and wait for new emails.')
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Seconds to wait when the outbox is empty.')
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = send_due_emails(options['batch_size'])
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                self.stdout.write(f'Sent {sent}, failed {failed}.')
+            if sent + failed == options['batch_size']:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Outbox is processed: {total_sent} sent, '
+            f'{total_failed} failed.'))
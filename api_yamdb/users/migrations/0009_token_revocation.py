@@ -0,0 +1,26 @@
+# Generated by Django 2.2.16 on 2026-10-18 06:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_outgoing_email'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenRevocation',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_id', models.PositiveIntegerField(unique=True, verbose_name='Пользователь')),
+                ('revoked_at', models.DateTimeField(verbose_name='Дата отзыва')),
+            ],
+            options={
+                'verbose_name': 'Отзыв токенов',
+                'verbose_name_plural': 'Отозванные токены',
+                'ordering': ['id'],
+            },
+        ),
+    ]
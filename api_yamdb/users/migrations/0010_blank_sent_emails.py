@@ -0,0 +1,20 @@
+# Generated by Django 2.2.16 on 2026-10-18 14:02
+
+from django.db import migrations
+
+
+def blank_sent_emails(apps, schema_editor):
+    OutgoingEmail = apps.get_model('users', 'OutgoingEmail')
+    OutgoingEmail.objects.filter(next_attempt_at__isnull=True).update(
+        body='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_token_revocation'),
+    ]
+
+    operations = [
+        migrations.RunPython(blank_sent_emails, migrations.RunPython.noop),
+    ]
@@ -58,3 +58,60 @@ class User(AbstractUser):
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
         ordering = ['id']
+
+
+class OutgoingEmail(models.Model):
+    subject = models.CharField(verbose_name='Тема', max_length=255)
+    body = models.TextField(verbose_name='Текст')
+    from_email = models.EmailField(verbose_name='Отправитель')
+    to = models.EmailField(verbose_name='Получатель')
+    created = models.DateTimeField(
+        verbose_name='Дата создания',
+        auto_now_add=True
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name='Следующая попытка',
+        null=True,
+        blank=True
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Попытки',
+        default=0
+    )
+    last_error = models.TextField(
+        verbose_name='Последняя ошибка',
+        blank=True
+    )
+    sent_at = models.DateTimeField(
+        verbose_name='Дата отправки',
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = 'Письмо'
+        verbose_name_plural = 'Очередь писем'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['next_attempt_at', 'id'],
+                         name='email_next_attempt_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} -> {self.to}'
+
+
+class TokenRevocation(models.Model):
+    user_id = models.PositiveIntegerField(
+        verbose_name='Пользователь',
+        unique=True
+    )
+    revoked_at = models.DateTimeField(verbose_name='Дата отзыва')
+
+    class Meta:
+        verbose_name = 'Отзыв токенов'
+        verbose_name_plural = 'Отозванные токены'
+        ordering = ['id']
+
+    def __str__(self):
+        return f'{self.user_id}: {self.revoked_at}'
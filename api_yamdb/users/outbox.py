@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+def enqueue_email(subject, body, from_email, recipient_list):
+    '''Put an email to the outbox, one row per recipient.'''
+    now = timezone.now()
+    return OutgoingEmail.objects.bulk_create([
+        OutgoingEmail(subject=subject, body=body, from_email=from_email,
+                      to=address, next_attempt_at=now)
+        for address in recipient_list
+    ])
+
+
+def retry_delay(attempts):
+    '''Seconds before the next attempt, doubled after every failure.'''
+    return min(settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1),
+               settings.EMAIL_OUTBOX_MAX_RETRY_DELAY)
+
+
+def claim_batch(size):
+    '''Due emails, leased for EMAIL_OUTBOX_LEASE seconds.
+
+    Other workers skip leased emails. Emails of a worker that died
+    while sending become due again when the lease ends.
+    '''
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(OutgoingEmail.objects.select_for_update(
+            skip_locked=True
+        ).filter(next_attempt_at__lte=now).order_by(
+            'next_attempt_at', 'id')[:size])
+        OutgoingEmail.objects.filter(
+            pk__in=[email.pk for email in emails]
+        ).update(next_attempt_at=now + timedelta(
+            seconds=settings.EMAIL_OUTBOX_LEASE))
+    return emails
+
+
+def mark_failed(email, error, now):
+    email.attempts += 1
+    email.last_error = repr(error)
+    if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.next_attempt_at = None
+        email.body = ''
+    else:
+        email.next_attempt_at = now + timedelta(
+            seconds=retry_delay(email.attempts))
+    email.save(update_fields=[
+        'attempts', 'last_error', 'next_attempt_at', 'body'])
+
+
+def deliver(emails, connection):
+    '''Send emails one by one, returns the sent ones and the errors of
+    the failed ones.'''
+    sent, errors = [], {}
+    for email in emails:
+        message = EmailMessage(email.subject, email.body, email.from_email,
+                               [email.to], connection=connection)
+        try:
+            message.send()
+        except Exception as error:
+            errors[email] = error
+        else:
+            sent.append(email)
+    return sent, errors
+
+
+def send_batch(emails):
+    '''Send emails over one connection, failed ones are retried later.
+
+    Bodies hold confirmation codes, they are blanked once an email is
+    sent or given up.
+    '''
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        sent, errors = [], dict.fromkeys(emails, error)
+    else:
+        try:
+            sent, errors = deliver(emails, connection)
+        finally:
+            connection.close()
+    now = timezone.now()
+    OutgoingEmail.objects.filter(
+        pk__in=[email.pk for email in sent]
+    ).update(sent_at=now, next_attempt_at=None, body='')
+    for email, error in errors.items():
+        mark_failed(email, error, now)
+    return len(sent), len(errors)
+
+
+def send_due_emails(batch_size):
+    '''Send one batch of due emails, returns numbers of sent and failed
+    ones.'''
+    emails = claim_batch(batch_size)
+    if not emails:
+        return 0, 0
+    return send_batch(emails)
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, pre_save
+from django.dispatch import receiver
+
+from .authentication import CLAIMS, revoke_tokens
+from .models import User
+
+
+@receiver(pre_save, sender=User)
+def revoke_changed_claims(sender, instance, **kwargs):
+    '''Tokens of a user stop working when their claims or is_active
+    change.'''
+    if instance.pk is None:
+        return
+    fields = (*CLAIMS, 'is_active')
+    saved = User.objects.filter(pk=instance.pk).values(*fields).first()
+    if saved and any(saved[name] != getattr(instance, name)
+                     for name in fields):
+        revoke_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted(sender, instance, **kwargs):
+    revoke_tokens(instance.pk)
@@ -1,9 +1,24 @@
 import sys
 from os.path import abspath, dirname, join
 
+import pytest
+
 root_dir = dirname(dirname(abspath(__file__)))
 sys.path.append(root_dir)
 infra_dir_path = join(root_dir, 'infra')
 
 pytest_plugins = [
+    'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_data',
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    from api.throttling import BUCKETS
+    from django.core.cache import caches
+
+    yield
+    for cache in caches.all():
+        cache.clear()
+    BUCKETS.clear()
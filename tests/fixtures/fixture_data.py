@@ -0,0 +1,31 @@
+import pytest
+
+
+@pytest.fixture
+def category():
+    from reviews.models import Category
+    return Category.objects.create(name='Фильм', slug='movie')
+
+
+@pytest.fixture
+def genre():
+    from reviews.models import Genre
+    return Genre.objects.create(name='Драма', slug='drama')
+
+
+@pytest.fixture
+def title(category, genre):
+    from reviews.models import Title
+    title = Title.objects.create(
+        name='Побег из Шоушенка', year=1994, category=category)
+    title.genre.add(genre)
+    return title
+
+
+@pytest.fixture
+def authors(django_user_model):
+    return [
+        django_user_model.objects.create_user(
+            username=f'author{number}', email=f'author{number}@yamdb.fake')
+        for number in range(3)
+    ]
@@ -0,0 +1,132 @@
+import pytest
+from reviews.models import Genre, LeaderboardEntry, Review, Title
+
+
+@pytest.mark.django_db
+class TestBulkTitles:
+    url = '/api/v1/titles/bulk/'
+
+    def test_create(self, admin_client, category, genre,
+                    django_assert_max_num_queries):
+        items = [
+            {'name': f'Произведение {number}', 'year': 2000,
+             'category': 'movie', 'genre': ['drama']}
+            for number in range(50)
+        ]
+
+        with django_assert_max_num_queries(30):
+            response = admin_client.post(self.url, items, format='json')
+
+        assert response.status_code == 201, (
+            'Проверьте, что `/api/v1/titles/bulk/` создает произведения '
+            'и возвращает статус 201'
+        )
+        data = response.json()
+        assert len(data) == 50
+        assert data[0]['category'] == {'name': 'Фильм', 'slug': 'movie'}
+        assert Title.objects.filter(genre=genre).count() == 50
+        title = Title.objects.get(pk=data[-1]['id'])
+        assert title.name == 'Произведение 49'
+        assert 'Драма' in title.search_text
+
+    def test_per_item_errors(self, admin_client, category, genre):
+        items = [
+            {'name': 'Хорошее', 'year': 2000, 'category': 'movie',
+             'genre': ['drama']},
+            {'name': 'Без категории', 'year': 2000, 'category': 'absent',
+             'genre': ['drama', 'absent']},
+            {'name': 'Из будущего', 'year': 3000, 'category': 'movie',
+             'genre': []},
+        ]
+
+        response = admin_client.post(self.url, items, format='json')
+
+        assert response.status_code == 207, (
+            'Проверьте, что при частичном успехе возвращается статус 207'
+        )
+        data = response.json()
+        assert data[0]['name'] == 'Хорошее'
+        assert set(data[1]['errors']) == {'category', 'genre'}
+        assert 'year' in data[2]['errors']
+        assert Title.objects.count() == 1
+
+    def test_update(self, admin_client, title):
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        items = [
+            {'id': title.pk, 'name': 'Новое название', 'genre': ['comedy']},
+            {'id': 999, 'name': 'Нет такого'},
+            {'name': 'Без id'},
+        ]
+
+        response = admin_client.patch(self.url, items, format='json')
+
+        assert response.status_code == 207
+        data = response.json()
+        assert data[0]['name'] == 'Новое название'
+        assert data[0]['genre'] == [{'name': 'Комедия', 'slug': 'comedy'}]
+        assert 'id' in data[1]['errors']
+        assert 'id' in data[2]['errors']
+        title.refresh_from_db()
+        assert title.name == 'Новое название'
+        assert list(title.genre.all()) == [comedy]
+        assert title.year == 1994
+
+    def test_boolean_id_rejected(self, admin_client, title):
+        response = admin_client.patch(
+            self.url, [{'id': True, 'name': 'Новое название'}],
+            format='json')
+
+        assert response.status_code == 400, (
+            'Проверьте, что true не принимается как id'
+        )
+        assert 'id' in response.json()[0]['errors']
+
+    def test_permissions_and_format(self, user_client, admin_client):
+        assert user_client.post(
+            self.url, [], format='json').status_code == 403
+        assert admin_client.post(
+            self.url, {'name': 'Не список'}, format='json'
+        ).status_code == 400
+
+
+@pytest.mark.django_db
+class TestBulkGenresAndReviews:
+
+    def test_genres(self, admin_client, genre):
+        items = [{'name': 'Комедия', 'slug': 'comedy'},
+                 {'name': 'Драма', 'slug': 'drama'},
+                 {'name': 'Комедия', 'slug': 'comedy'}]
+
+        response = admin_client.post(
+            '/api/v1/genres/bulk/', items, format='json')
+
+        assert response.status_code == 207
+        data = response.json()
+        assert data[0] == {'name': 'Комедия', 'slug': 'comedy'}
+        assert 'slug' in data[1]['errors']
+        assert 'slug' in data[2]['errors']
+        assert Genre.objects.count() == 2
+
+    def test_reviews(self, user_client, user, title, category):
+        second = Title.objects.create(name='Другое', year=2000,
+                                      category=category)
+        items = [{'title': title.pk, 'text': 'text', 'score': 8},
+                 {'title': second.pk, 'text': 'text', 'score': 4},
+                 {'title': title.pk, 'text': 'again', 'score': 1},
+                 {'title': 999, 'text': 'text', 'score': 5}]
+
+        response = user_client.post(
+            '/api/v1/reviews/bulk/', items, format='json')
+
+        assert response.status_code == 207
+        data = response.json()
+        assert data[0]['author'] == user.username
+        assert data[0]['id'] == Review.objects.get(title=title).pk
+        assert 'non_field_errors' in data[2]['errors']
+        assert 'title' in data[3]['errors']
+        title.refresh_from_db()
+        assert (title.rating, title.review_count) == (8, 1), (
+            'Проверьте, что массовое создание отзывов пересчитывает рейтинг'
+        )
+        assert LeaderboardEntry.objects.filter(
+            title=second, review_count=1).exists()
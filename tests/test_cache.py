@@ -0,0 +1,66 @@
+import pytest
+from api.cache import catalog_generation, get_cache, response_cache_key
+from django.db import transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from reviews.models import Genre, Review
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+
+    def test_titles_served_from_cache(self, client, title,
+                                      django_assert_num_queries):
+        url = f'/api/v1/titles/{title.pk}/'
+        first = client.get(url).json()
+
+        with django_assert_num_queries(1):
+            second = client.get(url).json()
+
+        assert first == second, (
+            'Проверьте, что повторный запрос отдается из кеша'
+        )
+
+    def test_query_params_in_key(self, client, title):
+        assert client.get('/api/v1/titles/').json()['count'] == 1
+        assert client.get('/api/v1/titles/?name=absent').json()['count'] == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_review_invalidates_rating(self, client, title, authors):
+        url = f'/api/v1/titles/{title.pk}/'
+        assert client.get(url).json()['rating'] is None
+
+        Review.objects.create(
+            text='text', score=8, title=title, author=authors[0])
+
+        assert client.get(url).json()['rating'] == 8, (
+            'Проверьте, что новый отзыв сбрасывает кеш произведений'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_genre_invalidates_list(self, client, genre):
+        assert client.get('/api/v1/genres/').json()['count'] == 1
+
+        Genre.objects.create(name='Комедия', slug='comedy')
+
+        assert client.get('/api/v1/genres/').json()['count'] == 2
+
+    @pytest.mark.django_db(transaction=True)
+    def test_invalidates_after_commit(self, title, authors):
+        generation = catalog_generation()
+        with transaction.atomic():
+            Review.objects.create(
+                text='text', score=8, title=title, author=authors[0])
+            assert catalog_generation() == generation, (
+                'Проверьте, что кеш сбрасывается только после коммита'
+            )
+
+        assert catalog_generation() != generation
+
+    def test_key_is_hashed(self):
+        request = Request(APIRequestFactory().get(
+            '/api/v1/titles/', {'name': 'пробел и ' + 'x' * 300}))
+        key = response_cache_key(request)
+
+        assert len(key) < 100 and ' ' not in key
+        get_cache().validate_key(key)
@@ -0,0 +1,110 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    def test_title_not_modified(self, client, title,
+                                django_assert_num_queries):
+        url = f'/api/v1/titles/{title.pk}/'
+        response = client.get(url)
+        etag = response['ETag']
+        assert response.has_header('Last-Modified')
+
+        with django_assert_num_queries(1):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304, (
+            'Проверьте, что при совпадении ETag возвращается 304'
+        )
+        assert response['ETag'] == etag
+
+    def test_review_changes_etag(self, client, title, authors):
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        title_url = f'/api/v1/titles/{title.pk}/'
+        etag = client.get(url)['ETag']
+        title_etag = client.get(title_url)['ETag']
+
+        review = Review.objects.create(
+            text='text', score=5, title=title, author=authors[0])
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что новый отзыв меняет ETag списка отзывов'
+        )
+        assert client.get(
+            title_url, HTTP_IF_NONE_MATCH=title_etag).status_code == 200, (
+            'Проверьте, что новый отзыв меняет ETag произведения'
+        )
+
+        etag = response['ETag']
+        review.delete()
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            'Проверьте, что удаление отзыва меняет ETag списка отзывов'
+        )
+
+    def test_comments_not_modified(self, client, title, authors):
+        review = Review.objects.create(
+            text='text', score=5, title=title, author=authors[0])
+        url = f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/'
+        etag = client.get(url)['ETag']
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+
+    def test_missing_title(self, client):
+        assert client.get('/api/v1/titles/999/').status_code == 404
+
+    def test_invalid_pk_not_found(self, client, title):
+        assert client.get('/api/v1/titles/abc/').status_code == 404, (
+            'Проверьте, что нечисловой id произведения возвращает 404'
+        )
+        assert client.get(
+            f'/api/v1/titles/{title.pk}/reviews/abc/'
+        ).status_code == 404
+
+    def test_cursor_pages_without_stamp(self, client, title):
+        url = f'/api/v1/titles/{title.pk}/reviews/?pagination=cursor'
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+
+        assert response.status_code == 200
+        assert not response.has_header('ETag')
+        assert not any('COUNT(' in query['sql']
+                       for query in context.captured_queries), (
+            'Проверьте, что в режиме курсора список не пересчитывается'
+        )
+
+    def test_title_list_stamp(self, client, title):
+        url = '/api/v1/titles/?pagination=cursor'
+        etag = client.get(url)['ETag']
+
+        with CaptureQueriesContext(connection) as context:
+            assert client.get(
+                url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        assert [query['sql'] for query in context.captured_queries
+                if 'COUNT(' in query['sql']] == [], (
+            'Проверьте, что ETag списка произведений не считает строки'
+        )
+
+        Title.objects.bulk_create([
+            Title(name='Новое', year=2000, category=title.category)])
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            'Проверьте, что загруженное в базу произведение меняет ETag'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_title_delete_changes_list_etag(client, title):
+    url = '/api/v1/titles/'
+    etag = client.get(url)['ETag']
+
+    Title.objects.filter(pk=title.pk).delete()
+
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        'Проверьте, что удаление произведения меняет ETag списка'
+    )
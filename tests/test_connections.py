@@ -0,0 +1,150 @@
+import os
+import threading
+
+import pytest
+
+from api_yamdb import connections
+from api_yamdb.connections import ConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    opened = 0
+
+    def __init__(self):
+        FakeConnection.opened += 1
+        self.closed = False
+        self.usable = True
+
+    def close(self):
+        self.closed = True
+
+
+class FakeWrapper:
+
+    def __init__(self, usable):
+        self.connection = FakeConnection()
+        self.connection.usable = usable
+
+    def is_usable(self):
+        return self.connection.usable
+
+    def close(self):
+        self.connection = None
+
+
+def make_pool(**options):
+    return ConnectionPool(FakeConnection, lambda conn: conn.usable,
+                          **options)
+
+
+class TestConnectionPool:
+
+    def test_reuse(self):
+        pool = make_pool(max_size=2)
+        first = pool.acquire()
+        pool.release(first)
+
+        assert pool.acquire() is first, (
+            'Проверьте, что пул отдает освободившееся соединение'
+        )
+        stats = pool.as_dict()
+        assert (stats['opened'], stats['reused'], stats['size']) == (1, 1, 1)
+
+    def test_timeout(self):
+        pool = make_pool(max_size=1, timeout=0.05)
+        pool.acquire()
+
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire()
+        assert pool.as_dict()['timeouts'] == 1
+
+    def test_waits_for_release(self):
+        pool = make_pool(max_size=1, timeout=5)
+        connection = pool.acquire()
+        timer = threading.Timer(0.05, pool.release, (connection,))
+        timer.start()
+
+        assert pool.acquire() is connection
+        timer.join()
+        stats = pool.as_dict()
+        assert stats['waits'] == 1
+        assert stats['max_wait_seconds'] >= 0.04
+
+    def test_broken_connections(self):
+        pool = make_pool(max_size=1, check_interval=0)
+        connection = pool.acquire()
+        connection.usable = False
+        pool.release(connection)
+
+        fresh = pool.acquire()
+        assert fresh is not connection and connection.closed, (
+            'Проверьте, что неработающее соединение заменяется новым'
+        )
+        pool.release(fresh, discard=True)
+        assert pool.as_dict()['size'] == 0
+        assert pool.as_dict()['discarded'] == 2
+
+
+class TestForking:
+
+    def test_close_idle(self):
+        pool = make_pool(max_size=2)
+        idle, busy = pool.acquire(), pool.acquire()
+        pool.release(idle)
+
+        pool.close_idle()
+
+        assert idle.closed and not busy.closed
+        assert (pool.as_dict()['size'], pool.as_dict()['idle']) == (1, 0)
+
+    def test_child_does_not_inherit_pools(self):
+        pool = connections.get_pool(
+            'fork_test', FakeConnection, lambda conn: conn.usable)
+        pool.release(pool.acquire())
+        try:
+            pid = os.fork()
+            if pid == 0:
+                os._exit(1 if connections.POOLS else 0)
+            _, status = os.waitpid(pid, 0)
+        finally:
+            connections.POOLS.pop('fork_test')
+
+        assert os.WEXITSTATUS(status) == 0, (
+            'Проверьте, что дочерний процесс не использует соединения '
+            'пула родителя'
+        )
+        assert not pool.idle[0][0].closed
+
+
+class TestHealthChecks:
+
+    def test_closes_unusable(self, monkeypatch, settings):
+        settings.DB_HEALTH_CHECK_INTERVAL = 30
+        healthy, broken = FakeWrapper(True), FakeWrapper(False)
+        monkeypatch.setattr(connections.connections, 'all',
+                            lambda: [healthy, broken])
+        connections.METRICS.reset()
+
+        connections.check_connections(sender=None)
+        connections.check_connections(sender=None)
+
+        assert healthy.connection is not None
+        assert broken.connection is None, (
+            'Проверьте, что неработающее соединение закрывается'
+        )
+        metrics = connections.METRICS.as_dict()
+        assert metrics['reused'] == 3
+        assert metrics['health_checks'] == 2
+        assert metrics['health_check_failures'] == 1
+
+
+@pytest.mark.django_db
+class TestDatabaseMetrics:
+    url = '/api/v1/metrics/db/'
+
+    def test_admin_only(self, admin_client, user_client):
+        assert user_client.get(self.url).status_code == 403
+        response = admin_client.get(self.url)
+        assert response.status_code == 200
+        assert set(response.json()) == {'connections', 'pools'}
+        assert response.json()['connections']['requests'] >= 1
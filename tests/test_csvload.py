@@ -0,0 +1,197 @@
+import csv
+
+import pytest
+from django.core.management import call_command
+from reviews.models import (Category, Comments, Genre, LeaderboardEntry,
+                            Review, Title)
+
+DATA = {
+    'users': [
+        {'id': 100, 'username': 'bingobongo', 'email': 'bingo@yamdb.fake',
+         'role': 'user', 'bio': '', 'first_name': '', 'last_name': ''},
+        {'id': 101, 'username': 'faust', 'email': 'faust@yamdb.fake',
+         'role': 'moderator', 'bio': '', 'first_name': '', 'last_name': ''},
+    ],
+    'category': [
+        {'id': 1, 'name': 'Фильм', 'slug': 'movie'},
+        {'id': 2, 'name': 'Книга', 'slug': 'book'},
+    ],
+    'genre': [
+        {'id': 1, 'name': 'Драма', 'slug': 'drama'},
+    ],
+    'titles': [
+        {'id': 1, 'name': 'Побег из Шоушенка', 'year': 1994, 'category': 1},
+        {'id': 2, 'name': 'Крестный отец', 'year': 1972, 'category': 1},
+        {'id': 3, 'name': 'Без категории', 'year': 1972, 'category': 99},
+    ],
+    'genre_title': [
+        {'id': 1, 'title_id': 1, 'genre_id': 1},
+        {'id': 2, 'title_id': 2, 'genre_id': 1},
+    ],
+    'review': [
+        {'id': 1, 'title_id': 1, 'text': 'a', 'author': 100, 'score': 10,
+         'pub_date': '2019-09-24T21:08:21.567Z'},
+        {'id': 2, 'title_id': 1, 'text': 'b', 'author': 101, 'score': 5,
+         'pub_date': '2019-09-24T21:08:21.567Z'},
+    ],
+    'comments': [
+        {'id': 1, 'review_id': 1, 'text': 'c', 'author': 101,
+         'pub_date': '2019-09-24T21:08:21.567Z'},
+    ],
+}
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    for name, rows in DATA.items():
+        with open(tmp_path / f'{name}.csv', 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    monkeypatch.setattr(
+        'reviews.parsers.csv_parsers.DIR', f'{tmp_path}/')
+    return tmp_path
+
+
+@pytest.mark.django_db
+class TestCsvLoad:
+
+    def load_all(self):
+        for name in DATA:
+            call_command('csvload', name, '--batch-size', '1')
+
+    def test_load_tables(self, data_dir, django_user_model):
+        self.load_all()
+
+        assert django_user_model.objects.count() == 2
+        assert Category.objects.count() == 2
+        assert Genre.objects.count() == 1
+        assert Title.objects.count() == 2, (
+            'Проверьте, что строки со ссылкой на несуществующий объект '
+            'пропускаются'
+        )
+        assert Title.objects.get(pk=2).genre.get().slug == 'drama'
+        assert Review.objects.get(pk=1).pub_date.year == 2019, (
+            'Проверьте, что дата публикации берется из файла'
+        )
+        assert Comments.objects.get().author.username == 'faust'
+        assert Title.objects.get(pk=1).rating == 7.5, (
+            'Проверьте, что после загрузки отзывов пересчитывается рейтинг'
+        )
+
+    def test_reload_does_not_duplicate(self, data_dir):
+        self.load_all()
+        self.load_all()
+
+        assert Review.objects.count() == 2
+        assert Title.genre.through.objects.count() == 2
+
+    def test_new_objects_after_load(self, data_dir):
+        self.load_all()
+
+        category = Category.objects.create(name='Музыка', slug='music')
+
+        assert category.pk == 3, (
+            'Проверьте, что счетчик первичных ключей сдвигается после загрузки'
+        )
+
+
+class TestCsvParse:
+
+    def test_batches(self, data_dir):
+        from reviews.parsers.csv_parsers import csv_parse
+
+        batches = list(csv_parse('titles', batch_size=2,
+                                 types={'id': int, 'year': int}))
+
+        assert [len(batch) for batch in batches] == [2, 1], (
+            'Проверьте, что csv_parse отдает строки пачками заданного размера'
+        )
+        assert batches[0][0]['id'] == 1
+        assert batches[0][0]['year'] == 1994
+        assert batches[0][0]['category'] == '1'
+
+    def test_missing_file(self, data_dir):
+        from reviews.parsers.csv_parsers import csv_parse
+
+        with pytest.raises(FileNotFoundError):
+            csv_parse('missing')
+
+
+@pytest.mark.django_db
+class TestCsvLoadAll:
+
+    def test_dependency_levels(self):
+        from reviews.loaders import TABLES, dependency_levels
+
+        assert dependency_levels(TABLES) == [
+            ['category', 'genre', 'users'],
+            ['titles'],
+            ['genre_title', 'review'],
+            ['comments'],
+        ], 'Проверьте порядок загрузки таблиц по внешним ключам'
+
+    def test_load_directory(self, data_dir):
+        call_command('csvload', '--all', '--data-dir', str(data_dir),
+                     '--workers', '1')
+
+        assert Title.objects.count() == 2
+        assert Comments.objects.count() == 1
+        assert Title.objects.get(pk=1).rating == 7.5
+
+    def test_derived_data_after_all_levels(self, data_dir, monkeypatch):
+        # With several workers review may finish before genre_title.
+        monkeypatch.setattr(
+            'reviews.management.commands.csvload.dependency_levels',
+            lambda names: [['category', 'genre', 'users'], ['titles'],
+                           ['review'], ['genre_title'], ['comments']])
+
+        call_command('csvload', '--all', '--data-dir', str(data_dir),
+                     '--workers', '1')
+
+        assert LeaderboardEntry.objects.filter(
+            kind=LeaderboardEntry.GENRE, slug='drama').count() == 2, (
+            'Проверьте, что рейтинги жанров строятся после загрузки всех '
+            'таблиц'
+        )
+
+
+@pytest.mark.django_db
+class TestCsvLoadResume:
+
+    def test_resume_after_failure(self, data_dir, monkeypatch):
+        from reviews.loaders import TABLES
+
+        for name in ('users', 'category', 'genre', 'titles'):
+            call_command('csvload', name)
+        table = TABLES['review']
+        build = table.build
+        built = []
+
+        def failing_build(fields):
+            if fields['id'] == 2:
+                raise RuntimeError('Import interrupted')
+            return build(fields)
+
+        monkeypatch.setattr(table, 'build', failing_build)
+        with pytest.raises(RuntimeError):
+            call_command('csvload', 'review', '--batch-size', '1')
+        assert Review.objects.count() == 1
+
+        def counting_build(fields):
+            built.append(fields['id'])
+            return build(fields)
+
+        monkeypatch.setattr(table, 'build', counting_build)
+        call_command('csvload', 'review', '--batch-size', '1', '--resume')
+
+        assert built == [2], (
+            'Проверьте, что --resume продолжает загрузку с последней '
+            'сохраненной строки'
+        )
+        assert Review.objects.count() == 2
+
+        call_command('csvload', 'review', '--resume')
+        assert built == [2], (
+            'Проверьте, что --resume пропускает загруженные таблицы'
+        )
@@ -27,3 +27,14 @@ class TestDockerfileCompose:
         assert re.search(r'image:\s+([a-zA-Z0-9]+)\/([a-zA-Z0-9_\.])+(\:[a-zA-Z0-9_-]+)?', docker_compose), (
             'Проверьте, что добавили сборку контейнера из образа на вашем DockerHub в файл docker-compose.yaml'
         )
+
+    def test_email_worker_volumes(self):
+        with open(os.path.join(infra_dir_path, 'docker-compose.yaml')) as f:
+            docker_compose = f.read()
+        worker = re.search(
+            r'\n  email_worker:\n((?:    .*\n|\n)*)', docker_compose)
+
+        assert worker, 'Проверьте, что в docker-compose.yaml есть email_worker'
+        assert 'static_value:/app/static/' in worker.group(1), (
+            'Проверьте, что email_worker пишет письма в общий том static_value'
+        )
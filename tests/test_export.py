@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from reviews.models import Comments, Genre, Review, Title
+
+
+@pytest.fixture
+def catalog(title, category, authors):
+    comedy = Genre.objects.create(name='Комедия', slug='comedy')
+    title.genre.add(comedy)
+    second = Title.objects.create(name='Без жанра', year=2000,
+                                  category=category)
+    review = Review.objects.create(text='Отзыв', score=8, title=title,
+                                   author=authors[0])
+    Comments.objects.create(text='Комментарий', review=review,
+                            author=authors[1])
+    return title, second
+
+
+def content(response):
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestExport:
+
+    def test_titles_ndjson(self, admin_client, catalog):
+        title, second = catalog
+        response = admin_client.get('/api/v1/export/titles.ndjson')
+
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        rows = [json.loads(line) for line in content(response).splitlines()]
+        assert rows == [
+            {'id': title.pk, 'name': 'Побег из Шоушенка', 'year': 1994,
+             'description': '', 'category': 'movie',
+             'genre': ['drama', 'comedy'], 'rating': 8.0,
+             'review_count': 1},
+            {'id': second.pk, 'name': 'Без жанра', 'year': 2000,
+             'description': '', 'category': 'movie', 'genre': [],
+             'rating': None, 'review_count': 0},
+        ], 'Проверьте, что экспорт произведений содержит жанры и рейтинг'
+
+    def test_reviews_and_comments_csv(self, admin_client, catalog):
+        title, _ = catalog
+        response = admin_client.get('/api/v1/export/reviews.csv')
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        assert len(rows) == 1
+        assert rows[0]['author'] == 'author0'
+        assert rows[0]['title_id'] == str(title.pk)
+
+        response = admin_client.get('/api/v1/export/comments.csv')
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        assert rows[0]['text'] == 'Комментарий'
+        assert rows[0]['title_id'] == str(title.pk)
+
+    def test_admin_only(self, client, user_client):
+        assert client.get(
+            '/api/v1/export/titles.csv').status_code == 401
+        assert user_client.get(
+            '/api/v1/export/titles.csv').status_code == 403
+        assert client.get(
+            '/api/v1/export/users.csv').status_code == 404
+
+    def test_command(self, catalog, tmp_path):
+        out = io.StringIO()
+        call_command('export', 'titles', stdout=out)
+        assert len(out.getvalue().splitlines()) == 2
+
+        path = tmp_path / 'reviews.csv'
+        call_command('export', 'reviews', '--format', 'csv',
+                     '--output', str(path))
+        assert path.read_text(encoding='utf-8').startswith(
+            'id,title_id,author,text,score,pub_date')
@@ -0,0 +1,31 @@
+import pytest
+from reviews.models import Title
+
+
+@pytest.mark.django_db
+class TestYearFilters:
+
+    @pytest.fixture(autouse=True)
+    def titles(self, category):
+        for year in (1972, 1994, 2010, 2019):
+            Title.objects.create(name=f'Фильм {year}', year=year,
+                                 category=category)
+
+    def years(self, client, query):
+        response = client.get(f'/api/v1/titles/?{query}')
+        return [item['year'] for item in response.json()['results']]
+
+    def test_exact(self, client):
+        assert self.years(client, 'year=1994') == [1994]
+        assert self.years(client, 'year=19') == [], (
+            'Проверьте, что фильтр year ищет точное совпадение'
+        )
+
+    def test_range(self, client):
+        assert self.years(client, 'year_min=1994') == [1994, 2010, 2019]
+        assert self.years(client, 'year_max=1994') == [1972, 1994]
+        assert self.years(client, 'year_min=1990&year_max=2015') == [
+            1994, 2010]
+
+    def test_multiple_values(self, client):
+        assert self.years(client, 'year_in=1972,2019') == [1972, 2019]
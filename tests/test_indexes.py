@@ -0,0 +1,98 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from reviews.models import Category, Comments, Review, Title
+
+INDEX_MARKERS = {
+    'sqlite': ('USING INDEX', 'USING COVERING INDEX',
+               'USING INTEGER PRIMARY KEY'),
+    'postgresql': ('Index Scan', 'Index Only Scan', 'Bitmap Index Scan'),
+}
+
+
+def explain(sql, params=()):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(f'EXPLAIN {sql}', params)
+            return [row[0] for row in cursor.fetchall()]
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def list_query_plan(client, url, table):
+    '''Plan of the query fetching a page of rows from table.'''
+    with CaptureQueriesContext(connection) as context:
+        assert client.get(url).status_code == 200
+    queries = [query['sql'] for query in context.captured_queries
+               if f'FROM "{table}"' in query['sql']
+               and 'LIMIT' in query['sql']]
+    assert queries, f'Запрос к {table} не найден'
+    return explain(queries[-1])
+
+
+def assert_index_scan(plan, table):
+    markers = INDEX_MARKERS[connection.vendor]
+    lines = [line for line in plan if table in line]
+    assert lines and all(
+        any(marker in line for marker in markers) for line in lines
+    ), f'Проверьте, что для {table} используется индекс: {plan}'
+
+
+@pytest.mark.django_db
+class TestListIndexes:
+
+    @pytest.fixture(autouse=True)
+    def seed(self, category, genre, django_user_model):
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'user{number}', email=f'user{number}@yamdb.fake')
+            for number in range(20)
+        ]
+        Category.objects.bulk_create(
+            Category(name=f'Категория {number}', slug=f'category{number}')
+            for number in range(9)
+        )
+        # bulk_create does not set primary keys on SQLite.
+        categories = list(Category.objects.all())
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {number}', year=2000,
+                  category=categories[number % len(categories)])
+            for number in range(200)
+        )
+        titles = list(Title.objects.all()[:20])
+        Review.objects.bulk_create(
+            Review(text='text', score=5, title=title, author=author)
+            for title in titles for author in authors
+        )
+        review = Review.objects.first()
+        Comments.objects.bulk_create(
+            Comments(text='text', review=review, author=author)
+            for author in authors
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.title = titles[0]
+        self.review = review
+
+    @pytest.mark.parametrize('query', ('', '?pagination=cursor'))
+    def test_reviews(self, client, query):
+        url = f'/api/v1/titles/{self.title.pk}/reviews/{query}'
+
+        assert_index_scan(
+            list_query_plan(client, url, 'reviews_review'), 'reviews_review')
+
+    @pytest.mark.parametrize('query', ('', '?pagination=cursor'))
+    def test_comments(self, client, query):
+        url = (f'/api/v1/titles/{self.title.pk}/reviews/{self.review.pk}'
+               f'/comments/{query}')
+
+        assert_index_scan(
+            list_query_plan(client, url, 'reviews_comments'),
+            'reviews_comments')
+
+    def test_titles_by_category(self, category):
+        queryset = Title.objects.filter(category=category).order_by('id')
+        sql, params = queryset[:10].query.sql_with_params()
+
+        assert_index_scan(explain(sql, params), 'reviews_title')
@@ -0,0 +1,129 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from reviews.models import Review
+from users.authentication import ClaimsAccessToken
+
+
+def claims_client(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {ClaimsAccessToken.for_user(user)}')
+    return client
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        assert client.get(url).status_code == 200
+    return len(context)
+
+
+@pytest.mark.django_db
+class TestClaimsAuthentication:
+
+    def test_token_has_claims(self, admin):
+        token = ClaimsAccessToken.for_user(admin)
+
+        assert (token['username'], token['role'], token['is_superuser']) == (
+            'TestAdmin', 'admin', False)
+
+    def test_get_without_user_query(self, client, user, title):
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        user_client = claims_client(user)
+        user_client.get(url)
+
+        assert count_queries(user_client, url) == count_queries(
+            client, url), (
+            'Проверьте, что пользователь из токена не загружается из базы'
+        )
+
+    def test_admin_role_from_claims(self, admin):
+        response = claims_client(admin).post(
+            '/api/v1/genres/', data={'name': 'Комедия', 'slug': 'comedy'})
+
+        assert response.status_code == 201
+
+    def test_ownership(self, user, authors, title):
+        own = Review.objects.create(
+            text='text', score=5, title=title, author=user)
+        other = Review.objects.create(
+            text='text', score=5, title=title, author=authors[0])
+        client = claims_client(user)
+        url = f'/api/v1/titles/{title.pk}/reviews/{{}}/'
+
+        assert client.patch(url.format(own.pk), {'score': 6}).status_code == 200
+        assert client.patch(
+            url.format(other.pk), {'score': 6}).status_code == 403, (
+            'Проверьте, что чужой отзыв нельзя изменить'
+        )
+
+    def test_create_review(self, user, title):
+        response = claims_client(user).post(
+            f'/api/v1/titles/{title.pk}/reviews/',
+            data={'text': 'Отзыв', 'score': 9})
+
+        assert response.status_code == 201
+        assert response.json()['author'] == user.username
+
+    def test_role_change_revokes_token(self, admin, genre):
+        client = claims_client(admin)
+        admin.role = 'user'
+        admin.save()
+
+        response = client.delete(f'/api/v1/genres/{genre.slug}/')
+        assert response.status_code == 401, (
+            'Проверьте, что токены с устаревшей ролью отклоняются'
+        )
+
+    def test_login_after_revocation(self, admin, genre):
+        admin.role = 'user'
+        admin.save()
+        admin.role = 'admin'
+        admin.save()
+
+        response = claims_client(admin).delete(
+            f'/api/v1/genres/{genre.slug}/')
+        assert response.status_code == 204, (
+            'Проверьте, что токен, выданный сразу после отзыва, принимается'
+        )
+
+    def test_deleted_user_token_rejected(self, user, title):
+        client = claims_client(user)
+        user.delete()
+
+        response = client.get(f'/api/v1/titles/{title.pk}/reviews/')
+        assert response.status_code == 401
+
+    def test_profile_loaded_from_database(self, user):
+        response = claims_client(user).get('/api/v1/users/me/')
+
+        assert response.status_code == 200
+        assert response.json()['email'] == user.email
+
+    def test_rename_self(self, user):
+        client = claims_client(user)
+
+        response = client.patch('/api/v1/users/me/', {'username': 'renamed'})
+
+        assert response.status_code == 200
+        assert response.json()['username'] == 'renamed', (
+            'Проверьте, что профиль после изменения берется из базы'
+        )
+        assert client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что смена имени отзывает старые токены'
+        )
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}')
+        assert client.get('/api/v1/users/me/').json()['username'] == (
+            'renamed'), (
+            'Проверьте, что ответ содержит новый токен'
+        )
+
+    def test_profile_update_keeps_token(self, user):
+        client = claims_client(user)
+
+        response = client.patch('/api/v1/users/me/', {'bio': 'Обо мне'})
+
+        assert 'token' not in response.json()
+        assert client.get('/api/v1/users/me/').status_code == 200
@@ -0,0 +1,128 @@
+from importlib import import_module
+
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+from reviews.models import Genre, LeaderboardEntry, Review, Title
+
+
+def create_titles(category, genre, scores, authors):
+    titles = []
+    for number, title_scores in enumerate(scores):
+        title = Title.objects.create(
+            name=f'Произведение {number}', year=2000, category=category)
+        title.genre.add(genre)
+        for author, score in zip(authors, title_scores):
+            Review.objects.create(text='text', score=score, title=title,
+                                  author=author)
+        titles.append(title)
+    return titles
+
+
+@pytest.mark.django_db
+class TestLeaderboards:
+
+    def top(self, client, url, **params):
+        response = client.get(url, params)
+        assert response.status_code == 200, (
+            f'Проверьте, что `{url}` возвращает статус 200'
+        )
+        return [title['name'] for title in response.json()]
+
+    def test_genre_and_category_top(self, client, category, genre, authors,
+                                    django_assert_num_queries):
+        create_titles(category, genre, [(5,), (9, 8), (7, 7, 7)], authors)
+
+        with django_assert_num_queries(3):
+            names = self.top(client, '/api/v1/genres/drama/top/')
+        assert names == [
+            'Произведение 1', 'Произведение 2', 'Произведение 0'
+        ], 'Проверьте, что лучшие произведения жанра отсортированы по рейтингу'
+        assert self.top(client, '/api/v1/categories/movie/top/') == names
+
+    def test_min_reviews_and_limit(self, client, category, genre, authors):
+        create_titles(category, genre, [(10,), (9, 8), (7, 7, 7)], authors)
+        url = '/api/v1/genres/drama/top/'
+
+        assert self.top(client, url, min_reviews=2) == [
+            'Произведение 1', 'Произведение 2'
+        ]
+        assert self.top(client, url, limit=1) == ['Произведение 0']
+
+    def test_bayesian(self, client, category, genre, authors, settings):
+        settings.LEADERBOARD_BAYESIAN_WEIGHT = 2
+        create_titles(category, genre, [(10,), (9, 9, 9), (1, 1)], authors)
+        call_command('refresh_leaderboards')
+        url = '/api/v1/genres/drama/top/'
+
+        assert self.top(client, url)[0] == 'Произведение 0'
+        assert self.top(client, url, bayesian='true')[0] == (
+            'Произведение 1'
+        ), (
+            'Проверьте, что байесовское среднее учитывает количество отзывов'
+        )
+
+    def test_bayesian_without_refresh(self, client, category, genre,
+                                      authors):
+        # The first title gets its entries while there are no reviews.
+        create_titles(category, genre, [(9,), (3,)], authors)
+
+        assert not LeaderboardEntry.objects.filter(
+            bayesian_rating__isnull=True).exists(), (
+            'Проверьте, что байесовский рейтинг считается без '
+            'refresh_leaderboards'
+        )
+        assert self.top(client, '/api/v1/genres/drama/top/',
+                        bayesian='true') == [
+            'Произведение 0', 'Произведение 1']
+
+    def test_migration_backfill(self, category, genre, authors):
+        create_titles(category, genre, [(6,), (7,)], authors)
+        call_command('refresh_leaderboards')
+        expected = sorted(LeaderboardEntry.objects.values_list(
+            'kind', 'slug', 'title_id', 'bayesian_rating'))
+        LeaderboardEntry.objects.all().delete()
+
+        import_module(
+            'reviews.migrations.0008_leaderboard'
+        ).fill_leaderboards(apps, None)
+
+        assert sorted(LeaderboardEntry.objects.values_list(
+            'kind', 'slug', 'title_id', 'bayesian_rating')) == expected
+
+    def test_follows_reviews_and_genres(self, client, category, genre,
+                                        authors):
+        first, second = create_titles(category, genre, [(6,), (7,)], authors)
+        review = first.reviews.get()
+        review.score = 10
+        review.save()
+        url = '/api/v1/genres/drama/top/'
+
+        assert self.top(client, url) == ['Произведение 0', 'Произведение 1']
+
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        first.genre.set([comedy])
+        assert self.top(client, url) == ['Произведение 1']
+        assert self.top(client, '/api/v1/genres/comedy/top/') == [
+            'Произведение 0'
+        ]
+
+        comedy.delete()
+        assert not LeaderboardEntry.objects.filter(slug='comedy').exists()
+
+    def test_refresh(self, category, genre, authors):
+        create_titles(category, genre, [(6,), (7,)], authors)
+        LeaderboardEntry.objects.all().delete()
+
+        call_command('refresh_leaderboards')
+
+        assert LeaderboardEntry.objects.count() == 4
+
+    def test_unknown_slug_and_bad_params(self, client, genre):
+        assert client.get('/api/v1/genres/drama/top/').json() == []
+        assert client.get(
+            '/api/v1/genres/absent/top/').status_code == 404
+        assert client.get(
+            '/api/v1/genres/drama/top/', {'limit': 'ten'}).status_code == 400
+        assert client.get(
+            '/api/v1/genres/drama/top/', {'limit': 1000}).status_code == 400
@@ -0,0 +1,98 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+from users.models import OutgoingEmail
+from users.outbox import enqueue_email, retry_delay, send_due_emails
+
+
+class FailingBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP сервер недоступен')
+
+
+class CountingBackend(BaseEmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return True
+
+    def send_messages(self, email_messages):
+        return len(email_messages)
+
+
+@pytest.mark.django_db
+class TestOutbox:
+
+    def test_signup_enqueues_email(self, client):
+        response = client.post('/api/v1/auth/signup/', data={
+            'username': 'newuser', 'email': 'newuser@yamdb.fake'})
+
+        assert response.status_code == 200
+        assert mail.outbox == [], (
+            'Проверьте, что регистрация не отправляет письмо сама'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.to == 'newuser@yamdb.fake'
+        assert email.next_attempt_at is not None
+
+        call_command('send_emails', stdout=StringIO())
+
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что команда send_emails отправляет письма из очереди'
+        )
+        assert 'Ваш код подтверждения' in mail.outbox[0].body
+        email.refresh_from_db()
+        assert email.sent_at is not None and email.next_attempt_at is None
+        assert email.body == '', (
+            'Проверьте, что код подтверждения не хранится после отправки'
+        )
+
+    def test_batch_uses_one_connection(self, settings):
+        settings.EMAIL_BACKEND = 'tests.test_outbox.CountingBackend'
+        CountingBackend.opened = 0
+        for number in range(5):
+            enqueue_email('Тема', 'Текст', 'admin@yamdb.ru',
+                          [f'user{number}@yamdb.fake'])
+
+        assert send_due_emails(10) == (5, 0)
+        assert CountingBackend.opened == 1, (
+            'Проверьте, что письма пачки отправляются через одно соединение'
+        )
+        assert send_due_emails(10) == (0, 0)
+
+    def test_retry_with_backoff(self, settings):
+        settings.EMAIL_BACKEND = 'tests.test_outbox.FailingBackend'
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        enqueue_email('Тема', 'Текст', 'admin@yamdb.ru', ['user@yamdb.fake'])
+
+        assert send_due_emails(10) == (0, 1)
+        email = OutgoingEmail.objects.get()
+        assert email.attempts == 1 and 'SMTP' in email.last_error
+        assert email.next_attempt_at > timezone.now() + timedelta(
+            seconds=retry_delay(1) - 5), (
+            'Проверьте, что неудачное письмо откладывается'
+        )
+        assert send_due_emails(10) == (0, 0)
+
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        assert send_due_emails(10) == (0, 1)
+        email.refresh_from_db()
+        assert email.next_attempt_at is None and email.sent_at is None, (
+            'Проверьте, что после EMAIL_OUTBOX_MAX_ATTEMPTS попыток письмо '
+            'больше не отправляется'
+        )
+        assert email.body == ''
+
+    def test_retry_delay_grows(self, settings):
+        settings.EMAIL_OUTBOX_RETRY_DELAY = 30
+        settings.EMAIL_OUTBOX_MAX_RETRY_DELAY = 100
+
+        assert [retry_delay(attempts) for attempts in range(1, 5)] == [
+            30, 60, 100, 100]
@@ -0,0 +1,94 @@
+import pytest
+from django.utils import timezone
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+
+    def walk(self, client, url, link='next'):
+        results = []
+        while url:
+            data = client.get(url).json()
+            assert 'count' not in data, (
+                'Проверьте, что в режиме курсора не считается общее количество'
+            )
+            results.extend(data['results'])
+            last, url = url, data[link]
+        return results, last
+
+    def test_titles_cursor(self, client, category):
+        for number in range(25):
+            Title.objects.create(
+                name=f'Произведение {number}', year=2000, category=category)
+
+        results, _ = self.walk(client, '/api/v1/titles/?pagination=cursor')
+
+        assert [item['id'] for item in results] == list(
+            Title.objects.values_list('id', flat=True))
+
+    def test_reviews_cursor(self, client, django_user_model, title):
+        for number in range(15):
+            author = django_user_model.objects.create_user(
+                username=f'user{number}', email=f'user{number}@yamdb.fake')
+            Review.objects.create(text='text', score=5, title=title,
+                                  author=author)
+
+        results, _ = self.walk(
+            client, f'/api/v1/titles/{title.pk}/reviews/?pagination=cursor')
+
+        assert [item['id'] for item in results] == list(
+            Review.objects.order_by('pub_date', 'id').values_list(
+                'id', flat=True))
+
+    def test_reviews_with_same_pub_date(self, client, django_user_model,
+                                        title):
+        # csvload keeps the dates of the files, many reviews share one.
+        django_user_model.objects.bulk_create(
+            django_user_model(username=f'user{number}',
+                              email=f'user{number}@yamdb.fake')
+            for number in range(1005))
+        Review.objects.bulk_create(
+            Review(text='text', score=5, title=title, author_id=pk)
+            for pk in django_user_model.objects.values_list('pk', flat=True))
+        Review.objects.update(pub_date=timezone.now())
+        expected = list(Review.objects.order_by('id').values_list(
+            'id', flat=True))
+
+        results, last = self.walk(
+            client, f'/api/v1/titles/{title.pk}/reviews/?pagination=cursor')
+
+        assert [item['id'] for item in results] == expected, (
+            'Проверьте, что курсор учитывает id при одинаковой дате'
+        )
+        results, _ = self.walk(client, last, link='previous')
+        assert [item['id'] for item in results] == [
+            pk for page_start in range(1000, -1, -10)
+            for pk in expected[page_start:page_start + 10]], (
+            'Проверьте ссылки на предыдущие страницы'
+        )
+
+    def test_invalid_cursor(self, client, title):
+        response = client.get(
+            f'/api/v1/titles/{title.pk}/reviews/?cursor=cD1hYmMmcD0x')
+
+        assert response.status_code == 404
+
+    def test_page_number_by_default(self, client, title):
+        data = client.get('/api/v1/titles/').json()
+
+        assert data['count'] == 1, (
+            'Проверьте, что по умолчанию используется постраничная пагинация'
+        )
+
+    def test_browsable_api_page_controls(self, client, category):
+        for number in range(11):
+            Title.objects.create(
+                name=f'Произведение {number}', year=2000, category=category)
+
+        response = client.get('/api/v1/titles/', HTTP_ACCEPT='text/html')
+
+        assert response.status_code == 200
+        assert 'class="pagination"' in response.content.decode(), (
+            'Проверьте, что в browsable API остались ссылки на страницы'
+        )
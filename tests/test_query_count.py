@@ -0,0 +1,146 @@
+import pytest
+from django.db import IntegrityError
+from reviews import signals
+from reviews.models import Comments, Genre, Review, Title
+
+PAGE_SIZES = (1, 10)
+
+
+def create_titles(count, category, genre):
+    extra_genre = Genre.objects.create(name='Комедия', slug='comedy')
+    for number in range(count):
+        title = Title.objects.create(
+            name=f'Произведение {number}', year=2000, category=category)
+        title.genre.add(genre, extra_genre)
+
+
+def create_reviews(count, title, django_user_model):
+    for number in range(count):
+        author = django_user_model.objects.create_user(
+            username=f'reviewer{number}', email=f'reviewer{number}@yamdb.fake')
+        Review.objects.create(
+            text='text', score=5, title=title, author=author)
+
+
+@pytest.mark.django_db
+class TestQueryCount:
+
+    @pytest.mark.parametrize('count', PAGE_SIZES)
+    def test_titles_list(self, client, django_assert_num_queries,
+                         category, genre, count):
+        create_titles(count, category, genre)
+
+        with django_assert_num_queries(4):
+            response = client.get('/api/v1/titles/')
+
+        assert len(response.json()['results']) == count
+
+    @pytest.mark.parametrize('count', PAGE_SIZES)
+    def test_titles_detail(self, client, django_assert_num_queries,
+                           category, genre, count):
+        create_titles(count, category, genre)
+        title = Title.objects.last()
+
+        with django_assert_num_queries(3):
+            client.get(f'/api/v1/titles/{title.pk}/')
+
+    @pytest.mark.parametrize('count', PAGE_SIZES)
+    def test_genres_list(self, client, django_assert_num_queries, count):
+        for number in range(count):
+            Genre.objects.create(name=f'Жанр {number}', slug=f'genre{number}')
+
+        with django_assert_num_queries(2):
+            response = client.get('/api/v1/genres/')
+
+        assert len(response.json()['results']) == count
+
+    @pytest.mark.parametrize('count', PAGE_SIZES)
+    def test_reviews_list(self, client, django_assert_num_queries,
+                          django_user_model, title, count):
+        create_reviews(count, title, django_user_model)
+
+        with django_assert_num_queries(4):
+            response = client.get(f'/api/v1/titles/{title.pk}/reviews/')
+
+        assert len(response.json()['results']) == count
+
+    @pytest.mark.parametrize('count', PAGE_SIZES)
+    def test_comments_list(self, client, django_assert_num_queries,
+                           django_user_model, title, count):
+        create_reviews(1, title, django_user_model)
+        review = Review.objects.get()
+        for number in range(count):
+            author = django_user_model.objects.create_user(
+                username=f'commenter{number}',
+                email=f'commenter{number}@yamdb.fake')
+            Comments.objects.create(text='text', review=review, author=author)
+
+        with django_assert_num_queries(4):
+            response = client.get(
+                f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/')
+
+        assert len(response.json()['results']) == count
+
+
+@pytest.mark.django_db
+class TestWriteQueryCount:
+
+    def test_review_create(self, user_client, title, authors,
+                           django_assert_num_queries):
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        # The very first review also fills the leaderboard prior mean.
+        Review.objects.create(
+            text='text', score=5, title=title, author=authors[0])
+
+        # user, title, savepoint, insert, rating update, histogram upsert,
+        # leaderboard update, release savepoint
+        with django_assert_num_queries(8):
+            response = user_client.post(url, {'text': 'text', 'score': 7})
+
+        assert response.status_code == 201
+        assert response.json()['author'] == 'TestUser'
+
+    def test_duplicate_review(self, user_client, title):
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        user_client.post(url, {'text': 'text', 'score': 7})
+
+        response = user_client.post(url, {'text': 'again', 'score': 3})
+
+        assert response.status_code == 400, (
+            'Проверьте, что второй отзыв на произведение возвращает 400'
+        )
+        assert response.json() == {'non_field_errors': [
+            'Можно оставить только один отзыв на произведение.']}
+        assert Review.objects.get().score == 7
+
+    def test_other_integrity_errors_raised(self, user_client, title,
+                                           monkeypatch):
+        def broken_add_score(*args, **kwargs):
+            raise IntegrityError('histogram')
+
+        monkeypatch.setattr(signals, 'add_score', broken_add_score)
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+
+        with pytest.raises(IntegrityError):
+            user_client.post(url, {'text': 'text', 'score': 7})
+        assert not Review.objects.exists(), (
+            'Проверьте, что чужие ошибки целостности не выдаются за '
+            'повторный отзыв'
+        )
+
+    def test_review_missing_title(self, user_client):
+        response = user_client.post(
+            '/api/v1/titles/999/reviews/', {'text': 'text', 'score': 7})
+
+        assert response.status_code == 404
+
+    def test_comment_create(self, user_client, title, authors,
+                            django_assert_num_queries):
+        review = Review.objects.create(
+            text='text', score=5, title=title, author=authors[0])
+        url = f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/'
+
+        with django_assert_num_queries(3):
+            response = user_client.post(url, {'text': 'text'})
+
+        assert response.status_code == 201
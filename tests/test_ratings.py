@@ -0,0 +1,62 @@
+import pytest
+from django.core.management import call_command
+from reviews.models import Review, Title
+
+
+def rating_of(title):
+    title = Title.objects.get(pk=title.pk)
+    return title.rating, title.review_count, title.score_sum
+
+
+@pytest.mark.django_db
+class TestTitleRating:
+
+    def test_rating_follows_reviews(self, title, authors):
+        assert rating_of(title) == (None, 0, 0), (
+            'Проверьте, что у произведения без отзывов нет рейтинга'
+        )
+        first = Review.objects.create(
+            text='a', score=10, title=title, author=authors[0])
+        second = Review.objects.create(
+            text='b', score=5, title=title, author=authors[1])
+        Review.objects.create(text='c', title=title, author=authors[2])
+        assert rating_of(title) == (7.5, 2, 15), (
+            'Проверьте, что рейтинг пересчитывается при создании отзыва'
+        )
+
+        second.score = 1
+        second.save()
+        assert rating_of(title) == (5.5, 2, 11), (
+            'Проверьте, что рейтинг пересчитывается при изменении отзыва'
+        )
+
+        first.delete()
+        assert rating_of(title) == (1.0, 1, 1), (
+            'Проверьте, что рейтинг пересчитывается при удалении отзыва'
+        )
+
+        Review.objects.filter(pk=second.pk).first().delete()
+        assert rating_of(title) == (None, 0, 0)
+
+    def test_rebuild_ratings_command(self, title, authors):
+        for author, score in zip(authors, (2, 3, 7)):
+            Review.objects.create(
+                text='text', score=score, title=title, author=author)
+        Title.objects.update(rating=None, review_count=0, score_sum=0)
+
+        call_command('rebuild_ratings')
+
+        assert rating_of(title) == (4.0, 3, 12), (
+            'Проверьте, что команда rebuild_ratings пересчитывает рейтинг'
+        )
+
+    def test_api_rating(self, client, title, authors):
+        for author, score in zip(authors, (4, 5, 5)):
+            Review.objects.create(
+                text='text', score=score, title=title, author=author)
+
+        response = client.get(f'/api/v1/titles/{title.pk}/')
+
+        assert response.json()['rating'] == 4, (
+            'Проверьте, что API возвращает целую часть среднего рейтинга'
+        )
@@ -0,0 +1,94 @@
+import pytest
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from reviews.models import Category, Review, Title
+
+from api_yamdb import routers
+
+REPLICA = 'replica_test'
+
+
+@pytest.fixture
+def replica(settings, tmp_path, title):
+    '''A second SQLite database standing in for a replica, holding a copy
+    of the title made before it got any reviews.'''
+    connections.databases[REPLICA] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+    }
+    settings.DATABASE_REPLICAS = [REPLICA]
+    call_command('migrate', database=REPLICA, verbosity=0)
+    Category.objects.using(REPLICA).bulk_create([title.category])
+    Title.objects.using(REPLICA).bulk_create([Title(
+        id=title.pk, name='Копия на реплике', year=title.year,
+        category_id=title.category_id)])
+    yield REPLICA
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.databases[REPLICA]
+
+
+class TestReplicaRouter:
+
+    def test_reads_from_primary_by_default(self, settings):
+        settings.DATABASE_REPLICAS = []
+        router = routers.ReplicaRouter()
+
+        assert routers.use_replica() is None
+        assert router.db_for_read(Title) is None, (
+            'Проверьте, что без реплик чтение идет из основной базы'
+        )
+
+    def test_writes_go_to_primary(self, settings):
+        settings.DATABASE_REPLICAS = ['replica_1']
+        router = routers.ReplicaRouter()
+        try:
+            assert routers.use_replica() == 'replica_1'
+            assert router.db_for_read(Title) == 'replica_1'
+            assert router.db_for_write(Title) == DEFAULT_DB_ALIAS, (
+                'Проверьте, что запись всегда идет в основную базу'
+            )
+        finally:
+            routers.use_primary()
+        assert router.db_for_read(Title) is None
+
+
+@pytest.mark.django_db
+class TestReplicaReads:
+
+    def test_safe_requests_read_replica(self, client, replica, title):
+        response = client.get(f'/api/v1/titles/{title.pk}/')
+
+        assert response.json()['name'] == 'Копия на реплике', (
+            'Проверьте, что GET запросы читают из реплики'
+        )
+        assert routers.state.alias is None, (
+            'Проверьте, что после запроса чтение возвращается в основную '
+            'базу'
+        )
+
+    def test_read_your_writes(self, client, user_client, replica, title):
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        response = user_client.post(url, data={'text': 'Отзыв', 'score': 9})
+        assert response.status_code == 201
+        assert Review.objects.filter(title=title).count() == 1
+
+        assert user_client.get(url).json()['results'], (
+            'Проверьте, что автор после записи читает из основной базы'
+        )
+        assert client.get(url).json()['results'] == [], (
+            'Проверьте, что остальные пользователи читают из реплики'
+        )
+        assert user_client.get(
+            f'/api/v1/titles/{title.pk}/'
+        ).json()['name'] == title.name
+
+    def test_pin_expires(self, settings, user_client, replica, title):
+        settings.DB_REPLICA_STICKY_SECONDS = 0
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        user_client.post(url, data={'text': 'Отзыв', 'score': 9})
+
+        assert user_client.get(url).json()['results'] == [], (
+            'Проверьте, что после DB_REPLICA_STICKY_SECONDS автор снова '
+            'читает из реплики'
+        )
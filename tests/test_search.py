@@ -0,0 +1,68 @@
+import pytest
+from reviews.models import Category, Genre, Title
+
+
+class TestInvertedIndex:
+
+    def test_ranking(self):
+        from api.search import InvertedIndex
+
+        index = InvertedIndex([
+            (1, (('Крестный отец', 3), ('про мафию', 1))),
+            (2, (('Мафия', 3), ('', 1))),
+            (3, (('Отец', 3), ('крестный путь', 1))),
+        ])
+
+        assert index.search('мафи') == [2, 1], (
+            'Проверьте, что совпадение в названии ранжируется выше'
+        )
+        assert index.search('крестный отец') == [1, 3]
+        assert index.search('нет такого') == []
+
+
+@pytest.mark.django_db
+class TestTitleSearch:
+
+    @pytest.fixture
+    def titles(self, category, genre):
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        books = Category.objects.create(name='Книга', slug='book')
+        first = Title.objects.create(
+            name='Двенадцать стульев', year=1928, category=books,
+            description='Остап Бендер ищет бриллианты')
+        first.genre.add(comedy)
+        second = Title.objects.create(
+            name='Бриллиантовая рука', year=1969, category=category)
+        second.genre.add(comedy, genre)
+        return first, second
+
+    def search(self, client, query):
+        response = client.get(f'/api/v1/titles/?search={query}')
+        return [item['name'] for item in response.json()['results']]
+
+    def test_search_fields(self, client, title, titles):
+        assert self.search(client, 'бриллиант') == [
+            'Бриллиантовая рука', 'Двенадцать стульев'], (
+            'Проверьте, что поиск учитывает название и описание '
+            'и ставит совпадения в названии выше'
+        )
+        assert self.search(client, 'комедия книга') == [
+            'Двенадцать стульев'], (
+            'Проверьте, что поиск учитывает жанры и категорию'
+        )
+
+    def test_search_follows_changes(self, client, titles):
+        first, _ = titles
+        first.genre.clear()
+
+        assert self.search(client, 'комедия') == ['Бриллиантовая рука']
+
+        Genre.objects.filter(slug='comedy').update(name='Фарс')
+        Genre.objects.get(slug='comedy').save()
+
+        assert self.search(client, 'фарс') == ['Бриллиантовая рука']
+
+    def test_search_with_filters(self, client, titles):
+        response = client.get('/api/v1/titles/?search=бриллиант&year=1928')
+
+        assert response.json()['count'] == 1
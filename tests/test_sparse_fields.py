@@ -0,0 +1,53 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+class TestSparseFields:
+    url = '/api/v1/titles/'
+
+    def results(self, client, **params):
+        response = client.get(self.url, params)
+        assert response.status_code == 200, (
+            f'Проверьте, что `{self.url}` с параметрами {params} '
+            'возвращает статус 200'
+        )
+        return response.json()['results']
+
+    def test_compact(self, client, title):
+        assert self.results(client, compact='true') == [
+            {'id': title.pk, 'name': title.name, 'year': 1994,
+             'rating': None}
+        ], 'Проверьте, что компактный список содержит только основные поля'
+
+    def test_fields_and_omit(self, client, title):
+        assert self.results(client, fields='name,year') == [
+            {'name': title.name, 'year': 1994}
+        ]
+        result = self.results(client, omit='description,genre')[0]
+        assert set(result) == {'id', 'name', 'year', 'rating', 'category'}
+        assert result['category'] == {'name': 'Фильм', 'slug': 'movie'}
+
+        detail = client.get(f'{self.url}{title.pk}/', {'fields': 'genre'})
+        assert detail.json() == {
+            'genre': [{'name': 'Драма', 'slug': 'drama'}]
+        }
+
+    def test_only_requested_columns(self, client, title):
+        with CaptureQueriesContext(connection) as context:
+            self.results(client, compact='true')
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert '"description"' not in sql, (
+            'Проверьте, что компактный список не читает описание из базы'
+        )
+        assert 'reviews_genre' not in sql
+        assert 'reviews_category' not in sql
+
+    def test_unknown_field(self, client, title):
+        response = client.get(self.url, {'fields': 'name,password'})
+        assert response.status_code == 400
+        assert 'fields' in response.json()
+        response = client.get(
+            self.url, {'compact': 'true', 'omit': 'description'})
+        assert response.status_code == 400
@@ -0,0 +1,64 @@
+import pytest
+from django.core.management import call_command
+from reviews.models import Review, ScoreHistogram
+
+
+@pytest.mark.django_db
+class TestTitleStats:
+
+    def stats(self, client, title):
+        return client.get(f'/api/v1/titles/{title.pk}/stats/').json()
+
+    def test_empty_title(self, client, title):
+        assert self.stats(client, title) == {
+            'review_count': 0, 'mean': None, 'median': None,
+            'distribution': {str(score): 0 for score in range(1, 11)},
+        }
+
+    def test_invalid_pk_not_found(self, client):
+        assert client.get('/api/v1/titles/abc/stats/').status_code == 404, (
+            'Проверьте, что нечисловой id произведения возвращает 404'
+        )
+
+    def test_histogram_follows_reviews(self, client, title, authors,
+                                       django_assert_num_queries):
+        reviews = [
+            Review.objects.create(text='text', score=score, title=title,
+                                  author=author)
+            for author, score in zip(authors, (2, 9, 10))
+        ]
+
+        with django_assert_num_queries(1):
+            stats = self.stats(client, title)
+        assert stats['review_count'] == 3
+        assert stats['mean'] == 7.0
+        assert stats['median'] == 9
+        assert stats['distribution']['9'] == 1
+
+        reviews[0].score = 10
+        reviews[0].save()
+        reviews[1].delete()
+        stats = self.stats(client, title)
+
+        assert stats['distribution']['2'] == 0
+        assert stats['distribution']['9'] == 0
+        assert stats['distribution']['10'] == 2, (
+            'Проверьте, что распределение оценок обновляется при изменении '
+            'и удалении отзывов'
+        )
+        assert stats['median'] == 10
+
+    def test_rebuild(self, client, title, authors):
+        for author, score in zip(authors, (1, 4, 5)):
+            Review.objects.create(text='text', score=score, title=title,
+                                  author=author)
+        ScoreHistogram.objects.all().delete()
+
+        call_command('rebuild_ratings')
+
+        stats = self.stats(client, title)
+        assert stats['median'] == 4
+        assert stats['distribution']['1'] == 1
+
+    def test_missing_title(self, client):
+        assert client.get('/api/v1/titles/999/stats/').status_code == 404
@@ -0,0 +1,116 @@
+import pytest
+from reviews.models import Title
+from api.throttling import ReviewCreateThrottle, SignupThrottle, TokenBuckets
+
+
+class TestTokenBuckets:
+
+    def test_burst_then_refill(self):
+        buckets = TokenBuckets(max_size=10)
+
+        assert [buckets.take('key', 3, 1.0, now=0) for _ in range(3)] == [
+            0, 0, 0]
+        assert buckets.take('key', 3, 1.0, now=0) == 1, (
+            'Проверьте, что пустое ведро возвращает время ожидания'
+        )
+        assert buckets.take('key', 3, 1.0, now=0.5) == 0.5
+        assert buckets.take('key', 3, 1.0, now=1.5) == 0, (
+            'Проверьте, что ведро пополняется со временем'
+        )
+        assert buckets.take('other', 3, 1.0, now=1.5) == 0
+
+    def test_cost(self):
+        buckets = TokenBuckets(max_size=10)
+
+        assert buckets.take('key', 5, 1.0, cost=3, now=0) == 0
+        assert buckets.take('key', 5, 1.0, cost=3, now=0) == 1, (
+            'Проверьте, что запрос забирает cost токенов'
+        )
+        assert buckets.take('key', 5, 1.0, cost=2, now=0) == 0
+
+    def test_least_recently_used_dropped(self):
+        buckets = TokenBuckets(max_size=2)
+        for key in ('first', 'second', 'third'):
+            buckets.take(key, 1, 1.0, now=0)
+
+        assert list(buckets.buckets) == ['second', 'third']
+
+
+@pytest.mark.django_db
+class TestThrottles:
+
+    def test_signup_retry_after(self, client, monkeypatch):
+        monkeypatch.setattr(SignupThrottle, 'rate', '2/min', raising=False)
+        for number in range(3):
+            response = client.post('/api/v1/auth/signup/', {
+                'username': f'user{number}',
+                'email': f'user{number}@yamdb.fake'})
+            assert response.status_code == (200 if number < 2 else 429), (
+                'Проверьте, что частые запросы регистрации ограничиваются'
+            )
+
+        assert response['Retry-After'] == '30', (
+            'Проверьте, что ответ 429 содержит заголовок Retry-After'
+        )
+
+    def test_review_create_per_user(self, client, user_client,
+                                    admin_client, title, monkeypatch):
+        monkeypatch.setattr(ReviewCreateThrottle, 'rate', '1/min',
+                            raising=False)
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        data = {'text': 'Отзыв', 'score': 7}
+
+        assert user_client.post(url, data).status_code == 201
+        assert user_client.post(url, data).status_code == 429
+        assert admin_client.post(url, data).status_code == 201, (
+            'Проверьте, что у каждого пользователя свой лимит'
+        )
+        assert client.get(url).status_code == 200, (
+            'Проверьте, что чтение не ограничивается'
+        )
+
+    def test_forwarded_for_spoofing(self, client, monkeypatch):
+        monkeypatch.setattr(SignupThrottle, 'rate', '1/min', raising=False)
+
+        def signup(number, forwarded_for):
+            return client.post('/api/v1/auth/signup/', {
+                'username': f'user{number}',
+                'email': f'user{number}@yamdb.fake',
+            }, HTTP_X_FORWARDED_FOR=forwarded_for).status_code
+
+        assert signup(0, '198.51.100.1, 203.0.113.5') == 200
+        assert signup(1, '198.51.100.2, 203.0.113.5') == 429, (
+            'Проверьте, что подмененный X-Forwarded-For не дает новый лимит'
+        )
+        assert signup(2, '203.0.113.6') == 200, (
+            'Проверьте, что разные клиенты за nginx получают свои лимиты'
+        )
+
+    def test_bulk_reviews_charged_per_item(self, user_client, category,
+                                           monkeypatch):
+        monkeypatch.setattr(ReviewCreateThrottle, 'rate', '3/min',
+                            raising=False)
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {number}', year=2000,
+                  category=category)
+            for number in range(5))
+        ids = list(Title.objects.values_list('pk', flat=True))
+        url = '/api/v1/reviews/bulk/'
+
+        def items(*title_ids):
+            return [{'title': pk, 'text': 'Отзыв', 'score': 7}
+                    for pk in title_ids]
+
+        assert user_client.post(
+            url, items(*ids[:4]), format='json').status_code == 429, (
+            'Проверьте, что пачка больше лимита отклоняется'
+        )
+        assert user_client.post(
+            url, items(*ids[:2]), format='json').status_code == 201
+        response = user_client.post(
+            f'/api/v1/titles/{ids[2]}/reviews/', items(ids[2])[0])
+        assert response.status_code == 201
+        assert user_client.post(
+            url, items(ids[3]), format='json').status_code == 429, (
+            'Проверьте, что каждый отзыв пачки расходует лимит'
+        )
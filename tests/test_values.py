@@ -0,0 +1,77 @@
+import pytest
+from django.core.cache import caches
+from rest_framework.renderers import JSONRenderer
+from reviews.models import Comments, Genre, Review, Title
+
+DATA = {
+    'text': 'Юникод, кавычки " и \\ , перевод\nстроки, \u2028 и \x01',
+    'numbers': [0, -1, 7.5, 8.0, 0.1 + 0.2, 123456789012, 2 ** 70],
+    'exponents': [1e-05, 1e-07, 1.5e16, -1e300],
+    'nested': {'empty': [], 'none': None, 'flag': True},
+}
+
+
+@pytest.fixture
+def catalog(title, category, authors):
+    comedy = Genre.objects.create(name='Комедия', slug='comedy')
+    title.genre.add(comedy)
+    title.description = 'Описание с \u2028 разделителем и "кавычками"'
+    title.save()
+    for number in range(12):
+        Title.objects.create(name=f'Произведение {number}', year=2000 + number,
+                             category=category)
+    for author, score in zip(authors, (3, 8, 10)):
+        review = Review.objects.create(
+            text=f'Отзыв {author.username} \u2029', score=score,
+            title=title, author=author)
+        Comments.objects.create(text='Комментарий', review=review,
+                                author=author)
+    return title, review
+
+
+@pytest.mark.django_db
+class TestValuesLists:
+
+    def responses(self, client, settings, url):
+        contents = []
+        for enabled in (False, True):
+            settings.API_VALUES_LISTS = enabled
+            for cache in caches.all():
+                cache.clear()
+            response = client.get(url)
+            assert response.status_code == 200
+            contents.append(response.content)
+        return contents
+
+    def test_same_bytes(self, client, settings, catalog):
+        title, review = catalog
+        urls = [
+            '/api/v1/titles/',
+            '/api/v1/titles/?page=2',
+            '/api/v1/titles/?pagination=cursor',
+            '/api/v1/titles/?compact=true',
+            '/api/v1/titles/?omit=description,category',
+            '/api/v1/titles/?fields=genre,rating',
+            '/api/v1/titles/?genre=comedy',
+            '/api/v1/titles/?search=шоушенк',
+            f'/api/v1/titles/{title.pk}/reviews/',
+            f'/api/v1/titles/{title.pk}/reviews/?pagination=cursor',
+            f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/',
+        ]
+        for url in urls:
+            old, new = self.responses(client, settings, url)
+            assert old == new, (
+                f'Проверьте, что `{url}` отдает те же байты, '
+                'что и сериализатор'
+            )
+
+    def test_renderer(self):
+        from api.renderers import FastJSONRenderer
+
+        for data in (DATA, DATA['numbers'], DATA['exponents'],
+                     {'text': DATA['text']}):
+            assert FastJSONRenderer().render(data) == JSONRenderer().render(
+                data), 'Проверьте, что рендерер совпадает с JSONRenderer'
+        assert FastJSONRenderer().render(
+            DATA, 'application/json; indent=4'
+        ) == JSONRenderer().render(DATA, 'application/json; indent=4')